@@ -1,7 +1,13 @@
 import streamlit as st
 import base64
+import pandas as pd
 from pathlib import Path
 
+# Copy-on-write pandas untuk seluruh proses, diatur sekali di entry point sebelum halaman mana pun
+# berjalan: hasil filter / slice dari dataset bersama tidak perlu di-.copy() dulu, dan mengubahnya
+# tidak pernah menyentuh data milik session lain (lihat JiraDataset dan apply_filters).
+pd.set_option('mode.copy_on_write', True)
+
 # --- Fungsi untuk menyisipkan gambar lokal sebagai Base64 ---
 def get_image_as_base64(path):
     """Membaca file gambar lokal dan mengubahnya menjadi string Base64."""
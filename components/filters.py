@@ -1,7 +1,120 @@
+import numpy as np
 import pandas as pd
 import re
 import streamlit as st # Diperlukan untuk reset_jira_filters karena berinteraksi dengan st.session_state
 
+from utils.jira_index import FacetIndex, LabelIndex
+from utils.jira_processed import build_quick_filters, platform_bits
+
+
+def _narrow_by_text(mask: np.ndarray, values: pd.Series, terms: list) -> None:
+    """
+    Mempersempit mask dengan pencarian teks (case-insensitive, salah satu term cocok).
+    Hanya baris yang masih lolos filter lain yang dicek, karena str.contains paling mahal.
+    """
+    candidates = np.flatnonzero(mask)
+    if len(candidates) == 0:
+        return
+    regex_pattern = '|'.join(map(re.escape, terms))
+    matches = values.iloc[candidates].astype(str).str.contains(regex_pattern, case=False, na=False)
+    mask[candidates] = matches.to_numpy(dtype=bool)
+
+
+def filter_mask(df_original: pd.DataFrame, 
+                ticket_id_search: str, 
+                status_filter: list, 
+                feature_filter: list, 
+                platform_filter: list, 
+                date_filter: tuple, 
+                labels_filter: list, 
+                stage_filter: list, 
+                solved_filter: str, 
+                title_filter: str,
+                pills_selection: str | None = None,
+                label_index: LabelIndex | None = None,
+                quick_filters: dict | None = None,
+                facet_index: FacetIndex | None = None,
+                title_tag_index: LabelIndex | None = None) -> np.ndarray:
+    """
+    Menggabungkan semua filter JIRA menjadi satu mask boolean sepanjang df_original.
+
+    Tidak ada DataFrame perantara yang dibuat; setiap filter hanya meng-AND-kan
+    mask-nya. Argumen sama seperti apply_filters.
+
+    Returns:
+        np.ndarray: Mask boolean; True untuk baris yang lolos semua filter.
+    """
+    mask = np.ones(len(df_original), dtype=bool)
+
+    # <<< BLOK FILTER PILLS DIMULAI >>>
+    # Filter berdasarkan pilihan dari st.pills: tag rilis / proyek dari Title (opsional per Stage)
+    if pills_selection and 'Title_Tags' in df_original.columns:
+        if title_tag_index is None:
+            title_tag_index = LabelIndex.from_series(df_original['Title_Tags'])
+        if quick_filters is None:
+            quick_filters = build_quick_filters(df_original, title_tag_index)
+        quick_filter = quick_filters.get(pills_selection)
+        if quick_filter is not None:
+            tag, stage = quick_filter
+            mask &= title_tag_index.mask([tag])
+            if stage is not None:
+                mask &= (df_original['Stage'] == stage).to_numpy()
+
+    # Filter berdasarkan Status, Feature, dan Stage
+    # (OR bitmap nilai terpilih dalam satu kolom, AND antar kolom; lihat FacetIndex)
+    facet_selections = {
+        name: selected
+        for name, selected in (('Status', status_filter), ('Feature', feature_filter), ('Stage', stage_filter))
+        if selected and name in df_original.columns
+    }
+    if facet_selections:
+        if facet_index is not None and facet_index.size == len(df_original) \
+                and all(name in facet_index for name in facet_selections):
+            mask &= facet_index.mask(facet_selections)
+        else:
+            for name, selected in facet_selections.items():
+                mask &= df_original[name].isin(selected).to_numpy()
+
+    # Filter berdasarkan Platform
+    # (tiket gabungan "Android & iOS" punya kedua bit di Platform_Flags, lihat jiraProgress_proc)
+    if platform_filter and 'Platform_Flags' in df_original.columns:
+        selected_bits = platform_bits(platform_filter)
+        mask &= (df_original['Platform_Flags'].to_numpy() & selected_bits) != 0
+
+    # Filter berdasarkan Date Range 'Created'
+    # (Created_Date sudah berupa tanggal WIB dari jiraProgress_proc, tidak perlu diparse ulang)
+    if date_filter and len(date_filter) == 2 and all(date_filter) and 'Created_Date' in df_original.columns:
+        start_date, end_date = pd.Timestamp(date_filter[0]), pd.Timestamp(date_filter[1])
+        mask &= df_original['Created_Date'].between(start_date, end_date).to_numpy()
+        
+    # Filter berdasarkan Labels
+    # (label dicocokkan persis lewat indeks keanggotaan, posisi = urutan baris df_original)
+    if labels_filter and 'Labels' in df_original.columns:
+        if label_index is None:
+            label_index = LabelIndex.from_series(df_original['Labels'])
+        mask &= label_index.mask(labels_filter)
+        
+    # Filter berdasarkan Solved/Not Yet (state dari tabel normalisasi status di jiraProgress_proc)
+    if solved_filter == 'Solved':
+        mask &= df_original['Is_Closed'].to_numpy()
+    elif solved_filter == 'Not Yet':
+        mask &= df_original['Is_Open'].to_numpy()
+
+    # Pencarian teks paling akhir, hanya untuk baris yang masih lolos
+    # Filter berdasarkan Ticket ID Search
+    if ticket_id_search and 'Tickets' in df_original.columns:
+        search_terms = [term.strip() for term in ticket_id_search.split(',') if term.strip()]
+        if search_terms:
+            _narrow_by_text(mask, df_original['Tickets'], search_terms)
+
+    # Filter berdasarkan Title Search
+    if title_filter and 'Title' in df_original.columns:
+        title_terms = [term.strip() for term in title_filter.split(',') if term.strip()]
+        if title_terms:
+            _narrow_by_text(mask, df_original['Title'], title_terms)
+
+    return mask
+
 
 def apply_filters(df_original: pd.DataFrame, 
                   ticket_id_search: str, 
@@ -13,10 +126,19 @@ def apply_filters(df_original: pd.DataFrame,
                   stage_filter: list, 
                   solved_filter: str, 
                   title_filter: str,
-                  pills_selection: str | None = None) -> pd.DataFrame: # <<< PARAMETER BARU DITAMBAHKAN
+                  pills_selection: str | None = None,
+                  label_index: LabelIndex | None = None,
+                  quick_filters: dict | None = None,
+                  facet_index: FacetIndex | None = None,
+                  title_tag_index: LabelIndex | None = None) -> pd.DataFrame: # <<< PARAMETER BARU DITAMBAHKAN
     """
     Menerapkan berbagai filter ke DataFrame JIRA.
 
+    Semua filter digabung dulu menjadi satu mask (lihat filter_mask), lalu
+    DataFrame hasilnya dibuat sekali saja. Dengan copy-on-write (diaktifkan di
+    Homepage.py) hasilnya aman diubah tanpa menyentuh df_original,
+    jadi pemanggil tidak perlu .copy() lagi.
+
     Args:
         df_original (pd.DataFrame): DataFrame JIRA asli.
         ticket_id_search (str): ID tiket yang dipisahkan koma untuk pencarian.
@@ -29,106 +151,28 @@ def apply_filters(df_original: pd.DataFrame,
         solved_filter (str): 'Solved', 'Not Yet', atau None.
         title_filter (str): Kata kunci yang dipisahkan koma untuk pencarian di 'Title'.
         pills_selection (str | None): Opsi yang dipilih dari st.pills. Defaultnya None.
+        label_index (LabelIndex | None): Indeks label milik df_original (JiraDataset.label_index).
+            Jika None, indeks dibangun dari kolom 'Labels' saat filter label dipakai.
+        quick_filters (dict | None): Pilihan pills dari build_quick_filters (JiraDataset.quick_filters).
+            Jika None, disusun dari df_original saat pills dipilih.
+        facet_index (FacetIndex | None): Bitmap Status/Feature/Stage milik df_original (JiraDataset.facet_index).
+            Jika None, filter kolom tersebut memakai isin biasa.
+        title_tag_index (LabelIndex | None): Indeks tag Title milik df_original (JiraDataset.title_tag_index).
+            Jika None, indeks dibangun dari kolom 'Title_Tags' saat pills dipilih.
         
     Returns:
         pd.DataFrame: DataFrame yang sudah difilter.
     """
-    df_filtered = df_original.copy()
-
-    # <<< BLOK FILTER PILLS DIMULAI >>>
-    # Filter berdasarkan pilihan dari st.pills
-    if pills_selection:
-        if pills_selection == 'PTR 1.1.0':
-            df_filtered = df_filtered[df_filtered['Title'].str.contains('PTR 1.1.0', na=False)]
-        
-        elif pills_selection == "SITBAU 1.1.0 GS 9.10.1":
-            df_filtered = df_filtered[
-                (df_filtered['Title'].str.contains('GS 9.10.1', na=False)) & 
-                (df_filtered['Stage'] == 'Regression')
-            ]
-
-        elif pills_selection == "PTR 1.1.0 GS 9.10.1":
-            df_filtered = df_filtered[
-                (df_filtered['Title'].str.contains('GS 9.10.1', na=False)) & 
-                (df_filtered['Stage'] == 'PTR')
-            ]
-            
-        elif pills_selection == "SITBAU Always On 1.1.0":
-            df_filtered = df_filtered[
-                (df_filtered['Title'].str.contains('Always On', na=False)) & 
-                (df_filtered['Stage'] == 'Regression')
-            ]
-
-        elif pills_selection == "PTR Always On 1.1.0":
-            df_filtered = df_filtered[
-                (df_filtered['Title'].str.contains('Always On', na=False)) & 
-                (df_filtered['Stage'] == 'PTR')
-            ]
-        
-        elif pills_selection == "Release 1.1.1 SITBAU":
-            df_filtered = df_filtered[
-                (df_filtered['Title'].str.contains('Release 1.1.1', na=False)) & 
-                (df_filtered['Stage'] == 'Regression')
-            ]
-
-    # Filter berdasarkan Ticket ID Search
-    if ticket_id_search and 'Tickets' in df_filtered.columns:
-        search_terms = [term.strip() for term in ticket_id_search.split(',') if term.strip()]
-        if search_terms:
-            regex_pattern = '|'.join(map(re.escape, search_terms))
-            df_filtered = df_filtered[df_filtered['Tickets'].astype(str).str.contains(regex_pattern, case=False, na=False)]
-
-    # Filter berdasarkan Status
-    if status_filter and 'Status' in df_filtered.columns:
-        df_filtered = df_filtered[df_filtered['Status'].isin(status_filter)]
-
-    # Filter berdasarkan Feature
-    if feature_filter and 'Feature' in df_filtered.columns:
-        df_filtered = df_filtered[df_filtered['Feature'].isin(feature_filter)]
-
-    # Filter berdasarkan Platform
-    if platform_filter and 'Platform' in df_filtered.columns:
-        platform_conditions = pd.Series([False] * len(df_filtered), index=df_filtered.index)
-        for p_select in platform_filter:
-            platform_conditions = platform_conditions | df_filtered['Platform'].astype(str).str.contains(p_select, case=False, na=False)
-        df_filtered = df_filtered[platform_conditions]
-
-    # Filter berdasarkan Date Range 'Created'
-    if date_filter and len(date_filter) == 2 and 'Created' in df_filtered.columns:
-        start_date, end_date = pd.to_datetime(date_filter[0]), pd.to_datetime(date_filter[1])
-        if not pd.api.types.is_datetime64_any_dtype(df_filtered['Created']):
-            df_filtered['Created'] = pd.to_datetime(df_filtered['Created'], errors='coerce')
-        df_filtered = df_filtered[
-            (df_filtered['Created'].dt.normalize() >= start_date.normalize()) &
-            (df_filtered['Created'].dt.normalize() <= end_date.normalize())
-        ]
-        
-    # Filter berdasarkan Labels
-    if labels_filter and 'Labels' in df_filtered.columns:
-        if not pd.api.types.is_string_dtype(df_filtered['Labels']):
-            df_filtered['Labels'] = df_filtered['Labels'].astype(str)
-        regex_pattern = '|'.join(map(re.escape, labels_filter))
-        df_filtered = df_filtered[df_filtered['Labels'].str.contains(regex_pattern, na=False)]
-        
-    # Filter berdasarkan Stage
-    if stage_filter and 'Stage' in df_filtered.columns:
-        df_filtered = df_filtered[df_filtered['Stage'].isin(stage_filter)]
-        
-    # Filter berdasarkan Solved/Not Yet
-    if solved_filter == 'Solved':
-        df_filtered = df_filtered[df_filtered['Resolved_Time'].notna()]
-    elif solved_filter == 'Not Yet':
-        if 'Status' in df_filtered.columns:
-            df_filtered = df_filtered[~df_filtered['Status'].isin(['RESOLVE', 'Invalid'])]
-
-    # Filter berdasarkan Title Search
-    if title_filter and 'Title' in df_filtered.columns:
-        title_terms = [term.strip() for term in title_filter.split(',') if term.strip()]
-        if title_terms:
-            regex_pattern = '|'.join(map(re.escape, title_terms))
-            df_filtered = df_filtered[df_filtered['Title'].astype(str).str.contains(regex_pattern, case=False, na=False)]
-            
-    return df_filtered
+    mask = filter_mask(
+        df_original, ticket_id_search, status_filter, feature_filter, platform_filter,
+        date_filter, labels_filter, stage_filter, solved_filter, title_filter,
+        pills_selection=pills_selection, label_index=label_index, quick_filters=quick_filters,
+        facet_index=facet_index, title_tag_index=title_tag_index,
+    )
+    if mask.all():
+        # Tanpa filter aktif: cukup view dangkal, tidak perlu menyalin seluruh data.
+        return df_original.copy(deep=False)
+    return df_original[mask]
 
 def reset_jira_filters(df_data: pd.DataFrame):
     """
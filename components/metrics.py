@@ -42,7 +42,7 @@ def display_summary_metrics(
             st.metric(
                 label="Total Open Tickets", 
                 value=f"{total_open_tickets}", 
-                help='Ticket that is not solved with status include everything except "Resolve" and "Invalid"'
+                help='Ticket that is not solved with status include everything except "Done" / "Resolve" / "Closed" and "Invalid"'
             )
 
     with col3:
@@ -1,19 +1,15 @@
 import streamlit as st
 import pandas as pd
-from utils.jira_processed import jiraProgress_proc
 from components.metrics import display_summary_metrics
 from datetime import datetime, timedelta
 import urllib.parse
-import json
 import plotly.graph_objects as go
-import numpy as np # Pastikan numpy diimpor karena digunakan oleh duration_to_hours dan format_hours_to_days_hours
 
-import re
 from streamlit_extras.stylable_container import stylable_container
 import streamlit_antd_components as sac
 
-from utils.gdrive_conn import get_list_files, read_file_from_drive
-from utils.jira_processed import jiraProgress_proc
+from utils.jira_data import get_jira_source, load_jira_dataset
+from utils.jira_processed import format_hours_to_days_hours
 
 # --- Import fungsi filter dari modul terpisah ---
 from components.filters import apply_filters, reset_jira_filters
@@ -39,47 +35,15 @@ st.html("""
     </style>
 """)
 
-@st.cache_data
-def load_and_process_jira_data(filename: str) -> pd.DataFrame:
-    """
-    Fungsi ini melakukan seluruh proses:
-    1. Mencari file di Google Drive.
-    2. Membaca konten file.
-    3. Mengubahnya menjadi DataFrame.
-    4. Memproses DataFrame.
-    5. Mengembalikan DataFrame yang sudah bersih.
-    
-    Decorator @st.cache_data di sini sangat efisien karena akan men-cache
-    hasil akhir (DataFrame yang sudah diproses), sehingga seluruh proses
-    di atas hanya berjalan sekali.
-    """
-    try:
-        all_files = get_list_files()
-        file_id = all_files.get(filename)
-        
-        if not file_id:
-            st.error(f"File '{filename}' tidak ditemukan di Google Drive.")
-            return pd.DataFrame()
-
-        file_content = read_file_from_drive(file_id)
-        df_raw = pd.read_csv(file_content)
-        df_processed = jiraProgress_proc(df_raw)
-        
-        return df_processed
-
-    except ValueError as ve:
-        st.error(f"Error saat memproses data: {ve}")
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Terjadi kesalahan yang tidak terduga: {e}")
-        return pd.DataFrame()
-
-# Nama file yang ingin kita proses
-NAMA_FILE_JIRA = 'jira_tiket.csv' 
+# Nama file yang ingin kita proses. Bisa juga pola glob (misal 'jira_tiket_*.csv')
+# atau manifest '*.manifest.json' lewat JIRA_SOURCE (env / gdrive_config di st.secrets).
+NAMA_FILE_JIRA = get_jira_source()
 
 # Cukup panggil satu fungsi ini untuk mendapatkan data matang
 with st.spinner("Sabar yah, lagi ngeload datanya nih hehe..", show_time=True):
-    df_jira_original = load_and_process_jira_data(NAMA_FILE_JIRA)
+    jira_dataset = load_jira_dataset(NAMA_FILE_JIRA)
+# Dataset dibagi semua session: cukup dibaca, jangan diubah di tempat (buat DataFrame turunan)
+df_jira_original = jira_dataset.frame if jira_dataset is not None else pd.DataFrame()
 
 
 # 1. Validasi kolom 'Created' dan siapkan filter tanggal
@@ -89,10 +53,7 @@ if 'Created' not in df_jira_original.columns or df_jira_original['Created'].drop
     max_date_data = None
 else:
     # 2. Jika kolom tanggal ada dan valid, lanjutkan proses
-    
-    # Konversi tipe data jika perlu
-    if not pd.api.types.is_datetime64_any_dtype(df_jira_original['Created']):
-        df_jira_original['Created'] = pd.to_datetime(df_jira_original['Created'], errors='coerce')
+    # (Created sudah berupa datetime WIB dari jiraProgress_proc)
 
     # 3. Dapatkan rentang tanggal AKTUAL dari data
     valid_dates = df_jira_original['Created'].dropna()
@@ -155,39 +116,6 @@ def svg_to_img(icon_svg):
     
     return data_uri
 
-def duration_to_hours(duration_str):
-    if not isinstance(duration_str, str) or duration_str.strip() == '':
-        return np.nan
-    total_hours = 0
-    hari_match = re.search(r'(\d+)\s*hari', duration_str)
-    if hari_match:
-        total_hours += int(hari_match.group(1)) * 24
-    jam_match = re.search(r'(\d+)\s*jam', duration_str)
-    if jam_match:
-        total_hours += int(jam_match.group(1))
-    menit_match = re.search(r'(\d+)\s*menit', duration_str)
-    if menit_match:
-        total_hours += int(menit_match.group(1)) / 60
-    return total_hours if total_hours > 0 else np.nan
-
-def format_hours_to_days_hours(total_hours):
-    if pd.isna(total_hours) or total_hours < 0:
-        return "N/A"
-    if total_hours < 1:
-        minutes = round(total_hours * 60)
-        if minutes == 0 and total_hours > 0:
-            return "Kurang dari 1 menit"
-        return f"{minutes} menit"
-    days = int(total_hours // 24)
-    remaining_hours = int(total_hours % 24)
-    parts = []
-    if days > 0:
-        parts.append(f"{days} hari")
-    if remaining_hours > 0:
-        parts.append(f"{remaining_hours} jam")
-    return " ".join(parts) if parts else f"{days} hari"
-
-
 try:
     with open(CSS_PATH) as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
@@ -270,14 +198,8 @@ with st.expander(':material/tune: Filter', expanded=False):
     with filter_col4:
         platform_opt_dynamic = []
         if 'Platform' in df_jira_original.columns and not df_jira_original.empty:
-            # Ambil semua platform unik dulu
-            unique_platforms = df_jira_original['Platform'].astype(str).unique().tolist()
-            
-            undesired_options = ["android & ios", "android&ios", "ios & android", "ios&android"]
-            platform_opt_dynamic = sorted([
-                p for p in unique_platforms 
-                if p.lower().replace(" ", "") not in undesired_options
-            ])
+            # Pilihan dari katalog yang ada di data ('Other' untuk platform di luar katalog); platform gabungan sudah dipecah ke Platform_Flags
+            platform_opt_dynamic = jira_dataset.platform_options
             
         platform_selected = st.multiselect(
             label='Platform',
@@ -307,11 +229,9 @@ with st.expander(':material/tune: Filter', expanded=False):
 
     with label_col:
         label_opt_dynamic = []
-        if "Labels" in df_jira_original.columns and not df_jira_original['Labels'].dropna().empty:
-            exploded_labels = df_jira_original['Labels'].dropna().str.split(',').explode()
-            unique_labels = sorted(exploded_labels.str.strip().unique())
-            
-            label_opt_dynamic = [label for label in unique_labels if label]
+        if jira_dataset is not None:
+            # Label unik sudah dipecah sekali saat data dimuat (JiraDataset.label_index)
+            label_opt_dynamic = jira_dataset.label_index.options
         
         # Kode multiselect lo tetap sama
         label_selected = st.multiselect(
@@ -366,7 +286,12 @@ with st.expander(':material/tune: Filter', expanded=False):
         )
     
     
-    options_data = ['PTR 1.1.0', 'SITBAU 1.1.0 GS 9.10.1', 'PTR 1.1.0 GS 9.10.1', 'SITBAU Always On 1.1.0', 'PTR Always On 1.1.0']
+    # Pilihan disusun dari tag rilis / proyek di Title, jadi rilis baru otomatis muncul
+    quick_filters = jira_dataset.quick_filters if jira_dataset is not None else {}
+    options_data = list(quick_filters)
+    if st.session_state.get('pills_selection') not in options_data:
+        # Tag yang dipilih sudah tidak ada di versi data terbaru
+        st.session_state.pills_selection = None
     st.pills("Quick filter by project:", options_data, selection_mode="single", key="pills_selection")
     
 current_filters = {
@@ -403,24 +328,23 @@ df_filtered = apply_filters(
     st.session_state.stage_filter,
     st.session_state.solved_filter,
     st.session_state.title_filter,
-    st.session_state.pills_selection
+    st.session_state.pills_selection,
+    label_index=jira_dataset.label_index if jira_dataset is not None else None,
+    facet_index=jira_dataset.facet_index if jira_dataset is not None else None,
+    title_tag_index=jira_dataset.title_tag_index if jira_dataset is not None else None,
+    quick_filters=quick_filters,
 )
 
-# 1. Konversi kolom waktu
-df_filtered['Resolved_Time'] = pd.to_datetime(df_filtered['Resolved_Time'], errors='coerce')
-
 total_tickets = len(df_filtered.index)
 
 # 2. Hitung tiket open & solved
-total_open_tickets = (df_filtered['Resolved_Time'].isna() & (df_filtered['Status'] != 'Invalid')).sum()
-total_solved_tickets = (df_filtered['Resolved_Time'].notna()).sum()
-total_invalid_ticket = (df_filtered['Status'] == 'Invalid').sum()
+total_open_tickets = df_filtered['Is_Open'].sum()
+total_solved_tickets = df_filtered['Is_Closed'].sum()
+total_invalid_ticket = df_filtered['Is_Invalid'].sum()
 
 
 # 3. Hitung rata-rata waktu penyelesaian
-solved_tickets_df = df_filtered[df_filtered['Resolved_Time'].notna()].copy()
-solved_tickets_df['duration_hours'] = solved_tickets_df['Duration_toResolve'].apply(duration_to_hours)
-avg_duration_in_hours = solved_tickets_df['duration_hours'].mean()
+avg_duration_in_hours = df_filtered.loc[df_filtered['Is_Closed'], 'Duration_toResolve_Hours'].mean()
 formatted_avg_duration = format_hours_to_days_hours(avg_duration_in_hours)
 
 
@@ -504,13 +428,12 @@ with main_col1:
         # Saran: Tambahkan key di sini dan masukkan ke 'current_filters' agar lebih konsisten
         hot_selection = st.pills(" ", hot_opt, default='Recent', label_visibility='collapsed', key="hot_filter")
         
-        df_for_display = df_filtered.copy()
+        df_for_display = df_filtered
         if hot_selection == "Hot":
             if 'Count_Comments' in df_for_display.columns:
                 df_for_display = df_for_display[df_for_display['Count_Comments'] > 3].reset_index(drop=True)
         elif hot_selection == "Recent":
             if 'Created' in df_for_display.columns:
-                df_for_display['Created'] = pd.to_datetime(df_for_display['Created'])
                 df_for_display = df_for_display.sort_values(by='Created', ascending=False).reset_index(drop=True)
                 
         total_tickets = len(df_for_display)
@@ -544,7 +467,7 @@ with main_col1:
                     except Exception:
                         shortened_title = ticket_title
                     button_key = f"select_{ticket_id}"
-                    indicator = "🔥 " if comment_count > 3 else ""
+                    indicator = "🔥 " if pd.notna(comment_count) and comment_count > 3 else ""
                     button_label = f"{indicator}**{ticket_id}**: {shortened_title}"
                     if st.button(button_label, key=button_key, use_container_width=True):
                         st.session_state.selected_ticket_id = ticket_id
@@ -683,7 +606,8 @@ with main_col2:
         
         col1_content += render_meta_item_html("Feature", ticket.get('Feature'))
         col1_content += render_meta_item_html("Platform", ticket.get('Platform'))
-        bug_type_val = ticket.get('Bug Type') or "UNCLASSIFIED"
+        bug_type_val = ticket.get('Bug Type')
+        if pd.isna(bug_type_val) or not bug_type_val: bug_type_val = "UNCLASSIFIED"
         col1_content += render_meta_item_html("Bug Type", bug_type_val)
         col1_content += render_meta_item_html("Labels", ticket.get('Labels'))
         col1_content += render_meta_item_html("Fix Versions", ticket.get('Fix_Versions'))
@@ -698,15 +622,10 @@ with main_col2:
         
         readable_date_format = '%d %B %Y, %H:%M'
 
-        # Helper function baru untuk memformat tanggal dengan aman
-        def format_date_safe(date_string):
-            if pd.notna(date_string) and str(date_string).strip() and str(date_string) != '–':
-                try:
-                    # Coba parse dan format tanggalnya
-                    return pd.to_datetime(date_string).strftime(readable_date_format) + " WIB"
-                except (ValueError, TypeError, pd.errors.ParserError):
-                    # Jika gagal, kembalikan string aslinya
-                    return str(date_string)
+        # Kolom waktu sudah berupa Timestamp WIB dari jiraProgress_proc, cukup diformat
+        def format_date_safe(timestamp):
+            if isinstance(timestamp, pd.Timestamp) and pd.notna(timestamp):
+                return timestamp.strftime(readable_date_format) + " WIB"
             return "–"
         
         created_str = format_date_safe(ticket.get('Created'))
@@ -734,9 +653,10 @@ with main_col2:
         details_html += "<hr style='border: none; border-top: 2px solid #e9ecef; margin: 30px 0px 30px 0px;'>"
         details_html += "<p style='font-size: 0.8em; color: #495057; margin-bottom: 30px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.5px;'>Description</p>"
         
-        # Ambil deskripsi yang sudah bersih dari dictionary 'ticket'.
-        # 'Description' adalah nama kolom baru yang kita buat di ipynb.
-        description_text = ticket.get('Description', '<i>Oops! No description available.</i>')
+        # Ambil deskripsi yang sudah bersih. 'Description' adalah nama kolom baru yang kita buat di ipynb.
+        # Kolom teks panjang tidak ikut di data tiket, diambil hanya untuk tiket yang dibuka.
+        ticket_details = jira_dataset.ticket_details(ticket.get('Tickets')) if jira_dataset is not None else {}
+        description_text = ticket_details.get('Description') or '<i>Oops! No description available.</i>'
         
         # Kita bungkus deskripsinya dalam div dengan style dasar.
         # Karena isinya sudah HTML (<table>, dll), dia akan dirender dengan benar.
@@ -791,7 +711,8 @@ with main_col3:
 
         with tab1:
             # st.markdown("<p style='font-size: 1.2em; font-weight: 600; color: #212529; margin-top:10px;'></p>", unsafe_allow_html=True)
-            comments_html_string = ticket.get('Comments_HTML', '')
+            ticket_details = jira_dataset.ticket_details(ticket.get('Tickets')) if jira_dataset is not None else {}
+            comments_html_string = ticket_details.get('Comments_HTML') or ''
             comment_scroll_container = st.container(height=1240)
             if pd.notna(comments_html_string) and comments_html_string.strip():
                 comment_scroll_container.html(f"<div style='padding-right:10px;'>{comments_html_string}</div>")
@@ -832,17 +753,11 @@ with main_col3:
         with tab2:
             # st.markdown("<p style='font-size: 1.2em; font-weight: 600; color: #212529; margin-top:10px;'>Riwayat Status</p>", unsafe_allow_html=True)
             
-            history_json_str = ticket.get('Status_History_JSON', '[]')
-            
-            try:
-                history_list = json.loads(history_json_str)
-            except json.JSONDecodeError:
-                history_list = []
-
-            if history_list:
-                df_history = pd.DataFrame(history_list)
-                df_history['timestamp'] = pd.to_datetime(df_history['timestamp'])
-                df_history = df_history.sort_values(by='timestamp').reset_index(drop=True)
+            # Riwayat sudah diparse sekali saat data dimuat (tabel event di JiraDataset),
+            # urut waktu dengan timestamp dalam WIB.
+            df_history = jira_dataset.ticket_history(ticket.get('Tickets'))
+
+            if not df_history.empty:
                 
                 def format_timedelta_short(td):
                     if pd.isna(td): return ""
@@ -889,7 +804,6 @@ with main_col3:
                         i += 1
                 
                 df_history_clean = pd.DataFrame(compressed_history)
-                df_history_clean['timestamp'] = pd.to_datetime(df_history_clean['timestamp'])
 
                 # ... (kode dari jawaban sebelumnya untuk y_positions, tick_values, tick_texts tetap sama, 
                 #       tapi sekarang menggunakan df_history_clean sebagai input) ...
@@ -1,9 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import re
 from datetime import datetime #
-from utils.jira_processed import jiraProgress_proc
 from datetime import datetime, timedelta
 
 import altair as alt
@@ -13,13 +11,12 @@ import plotly.graph_objects as go
 from streamlit_extras.stylable_container import stylable_container
 from st_keyup import st_keyup
 
-from utils.gdrive_conn import get_list_files, read_file_from_drive
-from utils.jira_processed import jiraProgress_proc
+from utils.jira_data import get_jira_source, load_jira_dataset
+from utils.jira_processed import format_hours_to_days_hours
+from utils.jira_schema import TIMEZONE
 from components.filters import apply_filters, reset_jira_filters
 from components.metrics import display_summary_metrics
 
-import json
-
 st.set_page_config(page_title='BSI Testing Insight', layout='wide')
 
 def truncate_feature_name(name, max_words=2):
@@ -41,41 +38,6 @@ st.html("""
     </style>
 """)
 
-@st.cache_data
-def load_and_process_jira_data(filename: str) -> pd.DataFrame:
-    """
-    Fungsi ini melakukan seluruh proses:
-    1. Mencari file di Google Drive.
-    2. Membaca konten file.
-    3. Mengubahnya menjadi DataFrame.
-    4. Memproses DataFrame.
-    5. Mengembalikan DataFrame yang sudah bersih.
-    
-    Decorator @st.cache_data di sini sangat efisien karena akan men-cache
-    hasil akhir (DataFrame yang sudah diproses), sehingga seluruh proses
-    di atas hanya berjalan sekali.
-    """
-    try:
-        all_files = get_list_files()
-        file_id = all_files.get(filename)
-        
-        if not file_id:
-            st.error(f"File '{filename}' tidak ditemukan di Google Drive.")
-            return pd.DataFrame()
-
-        file_content = read_file_from_drive(file_id)
-        df_raw = pd.read_csv(file_content)
-        df_processed = jiraProgress_proc(df_raw)
-        
-        return df_processed
-
-    except ValueError as ve:
-        st.error(f"Error saat memproses data: {ve}")
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Terjadi kesalahan yang tidak terduga: {e}")
-        return pd.DataFrame()
-
 def color_status(status_value):
     """
     Memberikan style CSS berdasarkan nilai status tiket.
@@ -122,12 +84,15 @@ def color_severity(severity_value):
     # Default, jika tidak ada yang cocok
     return ''
 
-# Nama file yang ingin kita proses
-NAMA_FILE_JIRA = 'jira_tiket.csv' 
+# Nama file yang ingin kita proses. Bisa juga pola glob (misal 'jira_tiket_*.csv')
+# atau manifest '*.manifest.json' lewat JIRA_SOURCE (env / gdrive_config di st.secrets).
+NAMA_FILE_JIRA = get_jira_source()
 
 # Cukup panggil satu fungsi ini untuk mendapatkan data matang
 with st.spinner("Sabar yah, lagi ngeload datanya nih hehe..", show_time=True):
-    df_jira_original = load_and_process_jira_data(NAMA_FILE_JIRA)
+    jira_dataset = load_jira_dataset(NAMA_FILE_JIRA)
+# Dataset dibagi semua session: cukup dibaca, jangan diubah di tempat (buat DataFrame turunan)
+df_jira_original = jira_dataset.frame if jira_dataset is not None else pd.DataFrame()
 
 
 # 1. Validasi kolom 'Created' dan siapkan filter tanggal
@@ -137,10 +102,7 @@ if 'Created' not in df_jira_original.columns or df_jira_original['Created'].drop
     max_date_data = None
 else:
     # 2. Jika kolom tanggal ada dan valid, lanjutkan proses
-    
-    # Konversi tipe data jika perlu
-    if not pd.api.types.is_datetime64_any_dtype(df_jira_original['Created']):
-        df_jira_original['Created'] = pd.to_datetime(df_jira_original['Created'], errors='coerce')
+    # (Created sudah berupa datetime WIB dari jiraProgress_proc)
 
     # 3. Dapatkan rentang tanggal AKTUAL dari data
     valid_dates = df_jira_original['Created'].dropna()
@@ -188,38 +150,6 @@ def svg_to_img(icon_svg):
     
     return data_uri
 
-def duration_to_hours(duration_str):
-    if not isinstance(duration_str, str) or duration_str.strip() == '':
-        return np.nan
-    total_hours = 0
-    hari_match = re.search(r'(\d+)\s*hari', duration_str)
-    if hari_match:
-        total_hours += int(hari_match.group(1)) * 24
-    jam_match = re.search(r'(\d+)\s*jam', duration_str)
-    if jam_match:
-        total_hours += int(jam_match.group(1))
-    menit_match = re.search(r'(\d+)\s*menit', duration_str)
-    if menit_match:
-        total_hours += int(menit_match.group(1)) / 60
-    return total_hours if total_hours > 0 else np.nan
-
-def format_hours_to_days_hours(total_hours):
-    if pd.isna(total_hours) or total_hours < 0:
-        return "N/A"
-    if total_hours < 1:
-        minutes = round(total_hours * 60)
-        if minutes == 0 and total_hours > 0:
-            return "Kurang dari 1 menit"
-        return f"{minutes} menit"
-    days = int(total_hours // 24)
-    remaining_hours = int(total_hours % 24)
-    parts = []
-    if days > 0:
-        parts.append(f"{days} hari")
-    if remaining_hours > 0:
-        parts.append(f"{remaining_hours} jam")
-    return " ".join(parts) if parts else f"{days} hari"
-
 def create_feature_squad_status_bubble_chart(df: pd.DataFrame):
     """
     Membuat bubble chart kategorikal untuk menunjukkan distribusi tiket
@@ -241,13 +171,13 @@ def create_feature_squad_status_bubble_chart(df: pd.DataFrame):
 
     # Pastikan kolom yang dibutuhkan tidak kosong
     required_cols = ['Feature', 'Squad', 'Status']
-    df_chart = df.dropna(subset=required_cols).copy()
+    df_chart = df.dropna(subset=required_cols)
 
     if df_chart.empty:
         return None
 
     # 1. Agregasi data: Hitung jumlah tiket untuk setiap kombinasi
-    bubble_data = df_chart.groupby(['Feature', 'Squad', 'Status']).size().reset_index(name='Jumlah Tiket')
+    bubble_data = df_chart.groupby(['Feature', 'Squad', 'Status'], observed=True).size().reset_index(name='Jumlah Tiket')
     
     # Tambahkan nama fitur yang dipotong untuk label sumbu Y
     bubble_data['Feature_Display'] = bubble_data['Feature'].apply(lambda name: truncate_feature_name(name, max_words=3))
@@ -305,20 +235,21 @@ def create_feature_squad_status_bubble_chart(df: pd.DataFrame):
     if df.empty:
         return None
 
-    # Salin DataFrame untuk menghindari SettingWithCopyWarning
-    df_chart = df.copy()
-
     # --- PERUBAHAN DIMULAI DI SINI ---
-    # Ganti nilai None/NaN di kolom 'Squad' menjadi 'Unclassified'
-    df_chart['Squad'] = df_chart['Squad'].fillna('Unclassified')
+    # Ganti nilai None/NaN di kolom 'Squad' menjadi 'Unclassified' lewat assign (DataFrame baru,
+    # df milik pemanggil tidak berubah). Squad bertipe category, jadi diubah ke object dulu.
     # Drop baris hanya jika 'Feature' atau 'Status' yang kosong
-    df_chart.dropna(subset=['Feature', 'Status'], inplace=True)
+    df_chart = (
+        df[['Feature', 'Squad', 'Status']]
+        .assign(Squad=lambda d: d['Squad'].astype(object).fillna('Unclassified'))
+        .dropna(subset=['Feature', 'Status'])
+    )
     # --- PERUBAHAN SELESAI DI SINI ---
 
     if df_chart.empty:
         return None
 
-    bubble_data = df_chart.groupby(['Feature', 'Squad', 'Status']).size().reset_index(name='Total Tickets')
+    bubble_data = df_chart.groupby(['Feature', 'Squad', 'Status'], observed=True).size().reset_index(name='Total Tickets')
     bubble_data['Feature_Display'] = bubble_data['Feature'].apply(lambda name: truncate_feature_name(name, max_words=3))
 
     fig = px.scatter(
@@ -333,7 +264,7 @@ def create_feature_squad_status_bubble_chart(df: pd.DataFrame):
     )
 
     # --- HITUNG DAN TAMBAHKAN TOTAL UNTUK SETIAP STATUS (ATAS) ---
-    status_totals = bubble_data.groupby('Status')['Total Tickets'].sum().reset_index()
+    status_totals = bubble_data.groupby('Status', observed=True)['Total Tickets'].sum().reset_index()
     for index, row in status_totals.iterrows():
         fig.add_annotation(
             x=row['Status'],
@@ -346,7 +277,7 @@ def create_feature_squad_status_bubble_chart(df: pd.DataFrame):
         )
 
     # --- HITUNG DAN TAMBAHKAN TOTAL UNTUK SETIAP FITUR (KANAN) ---
-    feature_totals = bubble_data.groupby('Feature_Display')['Total Tickets'].sum().reset_index()
+    feature_totals = bubble_data.groupby('Feature_Display', observed=True)['Total Tickets'].sum().reset_index()
     for index, row in feature_totals.iterrows():
         fig.add_annotation(
             x=1.02, # Posisikan sedikit di kanan area plot
@@ -455,14 +386,8 @@ with st.expander(':material/tune: Filter', expanded=False):
     with filter_col4:
         platform_opt_dynamic = []
         if 'Platform' in df_jira_original.columns and not df_jira_original.empty:
-            # Ambil semua platform unik dulu
-            unique_platforms = df_jira_original['Platform'].astype(str).unique().tolist()
-            
-            undesired_options = ["android & ios", "android&ios", "ios & android", "ios&android"]
-            platform_opt_dynamic = sorted([
-                p for p in unique_platforms 
-                if p.lower().replace(" ", "") not in undesired_options
-            ])
+            # Pilihan dari katalog yang ada di data ('Other' untuk platform di luar katalog); platform gabungan sudah dipecah ke Platform_Flags
+            platform_opt_dynamic = jira_dataset.platform_options
             
         platform_selected = st.multiselect(
             label='Platform',
@@ -492,11 +417,9 @@ with st.expander(':material/tune: Filter', expanded=False):
 
     with label_col:
         label_opt_dynamic = []
-        if "Labels" in df_jira_original.columns and not df_jira_original['Labels'].dropna().empty:
-            exploded_labels = df_jira_original['Labels'].dropna().str.split(',').explode()
-            unique_labels = sorted(exploded_labels.str.strip().unique())
-            
-            label_opt_dynamic = [label for label in unique_labels if label]
+        if jira_dataset is not None:
+            # Label unik sudah dipecah sekali saat data dimuat (JiraDataset.label_index)
+            label_opt_dynamic = jira_dataset.label_index.options
         
         # Kode multiselect lo tetap sama
         label_selected = st.multiselect(
@@ -550,7 +473,12 @@ with st.expander(':material/tune: Filter', expanded=False):
             type="secondary" # Membuat tombol terlihat 'secondary' (biasanya abu-abu)
         )
     
-    options_data = ['PTR 1.1.0', 'SITBAU 1.1.0 GS 9.10.1', 'PTR 1.1.0 GS 9.10.1', 'SITBAU Always On 1.1.0', 'PTR Always On 1.1.0', 'Release 1.1.1 SITBAU']
+    # Pilihan disusun dari tag rilis / proyek di Title, jadi rilis baru otomatis muncul
+    quick_filters = jira_dataset.quick_filters if jira_dataset is not None else {}
+    options_data = list(quick_filters)
+    if st.session_state.get('pills_selection') not in options_data:
+        # Tag yang dipilih sudah tidak ada di versi data terbaru
+        st.session_state.pills_selection = None
     st.pills("Quick filter by project:", options_data, selection_mode="single", key="pills_selection")
 
 df_filtered = apply_filters(
@@ -564,21 +492,21 @@ df_filtered = apply_filters(
     st.session_state.stage_filter,
     st.session_state.solved_filter,
     st.session_state.title_filter,
-    st.session_state.pills_selection
+    st.session_state.pills_selection,
+    label_index=jira_dataset.label_index if jira_dataset is not None else None,
+    facet_index=jira_dataset.facet_index if jira_dataset is not None else None,
+    title_tag_index=jira_dataset.title_tag_index if jira_dataset is not None else None,
+    quick_filters=quick_filters,
 )
 
 
-df_filtered['Resolved_Time'] = pd.to_datetime(df_filtered['Resolved_Time'], errors='coerce')
-
 total_tickets = len(df_filtered.index)
 
-total_open_tickets = (df_filtered['Resolved_Time'].isna() & (df_filtered['Status'] != 'Invalid')).sum()
-total_solved_tickets = (df_filtered['Resolved_Time'].notna()).sum()
-total_invalid_ticket = (df_filtered['Status'] == 'Invalid').sum()
+total_open_tickets = df_filtered['Is_Open'].sum()
+total_solved_tickets = df_filtered['Is_Closed'].sum()
+total_invalid_ticket = df_filtered['Is_Invalid'].sum()
 
-solved_tickets_df = df_filtered[df_filtered['Resolved_Time'].notna()].copy()
-solved_tickets_df['duration_hours'] = solved_tickets_df['Duration_toResolve'].apply(duration_to_hours)
-avg_duration_in_hours = solved_tickets_df['duration_hours'].mean()
+avg_duration_in_hours = df_filtered.loc[df_filtered['Is_Closed'], 'Duration_toResolve_Hours'].mean()
 formatted_avg_duration = format_hours_to_days_hours(avg_duration_in_hours)
 
 
@@ -634,9 +562,9 @@ col1, col2 = st.columns([1.6,2.4])
 with col1:
 
     valid_status = ['Highest', 'Medium', 'Low']
-    df_final = df_filtered[df_filtered['Severity'].isin(valid_status)].copy()
+    df_final = df_filtered[df_filtered['Severity'].isin(valid_status)]
 
-    chart_data = df_final.groupby(['Feature', 'Severity']).size().reset_index(name='Total Tickets') # bikin total tiket
+    chart_data = df_final.groupby(['Feature', 'Severity'], observed=True).size().reset_index(name='Total Tickets') # bikin total tiket
     chart_data['Feature_Display'] = chart_data['Feature'].apply(truncate_feature_name)
 
     color_scheme = {'Highest': '#E63946', 'Medium': '#FCA311', 'Low': '#147DF5'}
@@ -803,20 +731,16 @@ with col1:
 
         if 'df_filtered' in locals() and not df_filtered.empty:
             
-            # --- KUNCI 2: Logika Status yang Lebih Tegas ---
-            resolved_statuses = ['Done', 'RESOLVE', 'Resolve', 'Done.', 'DONE', 'Closed']
-            invalid_statuses = ['Invalid']
-
-            # Buat filter boolean untuk setiap kategori
-            is_resolved = df_filtered['Status'].isin(resolved_statuses)
-            is_invalid = df_filtered['Status'].isin(invalid_statuses)
-            # Tiket 'Open' adalah semua tiket yang BUKAN resolved DAN BUKAN invalid
-            is_open = ~is_resolved & ~is_invalid
+            # --- KUNCI 2: State tiket dari tabel normalisasi status (jiraProgress_proc) ---
+            is_resolved = df_filtered['Is_Closed']
+            is_invalid = df_filtered['Is_Invalid']
+            is_open = df_filtered['Is_Open']
 
             # Mapping untuk kelas CSS
             severity_color_map = {'Highest': 'severity-highest', 'Medium': 'severity-medium', 'Low': 'severity-low'}
             
-            features_sorted = df_filtered['Feature'].value_counts().index.tolist()
+            feature_counts = df_filtered['Feature'].value_counts()
+            features_sorted = feature_counts[feature_counts > 0].index.tolist()
 
             if not features_sorted:
                 st.info("No tickets with features found for the selected filters.")
@@ -907,46 +831,33 @@ with col1:
 
         # FUNGSI DIPERBARUI: Menghitung data harian, bukan kumulatif
         @st.cache_data
-        def prepare_daily_activity_data(df):
+        def prepare_daily_activity_data(_events, dataset_version, positions):
             """
-            Memproses seluruh DataFrame untuk mengekstrak event 'open' dan 'solved'
-            dan menghitung jumlahnya per hari.
+            Mengambil event 'open', 'solved', dan 'invalid' dari tabel event riwayat status
+            untuk tiket-tiket yang terfilter, lalu menghitung jumlahnya per hari.
+            _events tidak di-hash; cache dibedakan lewat versi dataset dan posisi tiket.
             """
-            all_events = []
-            
-            solved_states = ['Done', 'RESOLVE', 'Resolve', 'Done.', 'DONE', 'Closed']
-            reopen_states = ['Reopened', 'REOPEN']
-            invalid_states = ['Invalid']
+            events = _events[np.isin(_events['ticket_pos'].to_numpy(), positions)]
+            if events.empty:
+                return pd.DataFrame()
 
-            for index, row in df.iterrows():
-                history_json_str = row.get('Status_History_JSON')
-                if not history_json_str or not isinstance(history_json_str, str):
-                    continue
+            event_type = np.select(
+                [
+                    events['status_from'].isna().to_numpy(),
+                    (events['state_to'] == 'Reopened').to_numpy(),
+                    (events['state_to'] == 'Closed').to_numpy(),
+                    (events['state_to'] == 'Invalid').to_numpy(),
+                ],
+                ['open', 'open', 'solved', 'invalid'],
+                default='',
+            )
+            event_date = pd.to_datetime(events['timestamp'].to_numpy(), utc=True).tz_convert(TIMEZONE).tz_localize(None).normalize()
 
-                try:
-                    history_data = json.loads(history_json_str)
-                    if not isinstance(history_data, list): continue
-
-                    for event in history_data:
-                        timestamp = pd.to_datetime(event.get('timestamp'))
-                        status_to = event.get('status_to')
-                        status_from = event.get('status_from')
-
-                        if status_from is None:
-                            all_events.append({'date': timestamp.date(), 'type': 'open'})
-                        elif status_to in reopen_states:
-                            all_events.append({'date': timestamp.date(), 'type': 'open'})
-                        elif status_to in solved_states:
-                            all_events.append({'date': timestamp.date(), 'type': 'solved'})
-                        elif status_to in invalid_states:
-                            all_events.append({'date': timestamp.date(), 'type': 'invalid'})
-                except (json.JSONDecodeError, TypeError):
-                    continue
-                    
-            if not all_events:
+            events_df = pd.DataFrame({'date': event_date, 'type': event_type})
+            events_df = events_df[events_df['type'] != '']
+            if events_df.empty:
                 return pd.DataFrame()
 
-            events_df = pd.DataFrame(all_events)
             daily_counts = events_df.groupby(['date', 'type']).size().unstack(fill_value=0)
 
             # Pastikan kedua kolom ada
@@ -967,8 +878,7 @@ with col1:
         # Pastikan df_filtered ada sebelum menjalankan proses
         if 'df_filtered' in locals() and not df_filtered.empty:
             with st.spinner('Analyzing daily ticket activity...'):
-                # Fungsi prepare_daily_activity_data tidak perlu diubah, tetap sama
-                daily_df = prepare_daily_activity_data(df_filtered)
+                daily_df = prepare_daily_activity_data(jira_dataset.events, jira_dataset.files, df_filtered.index.to_numpy())
 
             if not daily_df.empty:
                 # --- Membuat Plot Line Chart Estetik dengan Plotly Graph Objects ---
@@ -1062,45 +972,26 @@ with col1:
 
         # --- FUNGSI BARU DENGAN LOGIKA PER TIKET (YANG BENAR) ---
         @st.cache_data
-        def prepare_ticket_lifecycle_data(df):
+        def prepare_ticket_lifecycle_data(_events, dataset_version, positions):
             """
             Menganalisis riwayat setiap tiket untuk menemukan tanggal pembukaan pertamanya
             dan tanggal penutupan terakhirnya, lalu menghitung jumlah kumulatif.
+            Tabel event sudah urut per tiket lalu per waktu, jadi event pertama dan
+            terakhir tiap tiket cukup dicari dari batas pergantian ticket_pos.
             """
-            opened_dates = []
-            closed_dates = []
-
-            solved_states = ['Done', 'RESOLVE', 'Resolve', 'Done.', 'DONE', 'Closed']
-            invalid_states = ['Invalid']
-            final_closed_states = solved_states + invalid_states
+            events = _events[np.isin(_events['ticket_pos'].to_numpy(), positions)]
+            ticket_pos = events['ticket_pos'].to_numpy()
+            is_first = np.diff(ticket_pos, prepend=-1) != 0
+            is_last = np.diff(ticket_pos, append=-1) != 0
 
-            for index, row in df.iterrows():
-                history_json_str = row.get('Status_History_JSON')
-                if not history_json_str or not isinstance(history_json_str, str):
-                    continue
-                
-                try:
-                    history_data = json.loads(history_json_str)
-                    if not isinstance(history_data, list) or not history_data:
-                        continue
-
-                    # PENTING: Urutkan riwayat berdasarkan timestamp untuk menemukan event pertama dan terakhir
-                    history_data.sort(key=lambda x: pd.to_datetime(x.get('timestamp')))
-
-                    # 1. Tentukan tanggal tiket DIBUAT (hanya event pertama)
-                    first_event = history_data[0]
-                    if first_event.get('status_from') is None:
-                        opened_dates.append(pd.to_datetime(first_event['timestamp']).date())
-                    
-                    # 2. Tentukan tanggal tiket FINAL DITUTUP (hanya event terakhir)
-                    last_event = history_data[-1]
-                    if last_event.get('status_to') in final_closed_states:
-                        closed_dates.append(pd.to_datetime(last_event['timestamp']).date())
+            event_date = pd.to_datetime(events['timestamp'].to_numpy(), utc=True).tz_convert(TIMEZONE).tz_localize(None).normalize()
 
-                except (json.JSONDecodeError, TypeError, KeyError):
-                    continue
+            # 1. Tentukan tanggal tiket DIBUAT (hanya event pertama)
+            opened_dates = event_date[is_first & events['status_from'].isna().to_numpy()]
+            # 2. Tentukan tanggal tiket FINAL DITUTUP (hanya event terakhir)
+            closed_dates = event_date[is_last & events['state_to'].isin(['Closed', 'Invalid']).to_numpy()]
 
-            if not opened_dates:
+            if len(opened_dates) == 0:
                 return pd.DataFrame()
 
             # Hitung jumlah tiket unik yang dibuka/ditutup per hari
@@ -1122,7 +1013,7 @@ with col1:
         # Jalankan proses dengan fungsi baru
         if 'df_filtered' in locals() and not df_filtered.empty:
             with st.spinner('Analyzing ticket lifecycle...'):
-                lifecycle_df = prepare_ticket_lifecycle_data(df_filtered)
+                lifecycle_df = prepare_ticket_lifecycle_data(jira_dataset.events, jira_dataset.files, df_filtered.index.to_numpy())
 
             if not lifecycle_df.empty:
                 # Bagian plotting ini sama, hanya sumber datanya yang berbeda
@@ -1180,22 +1071,13 @@ with col2:
                     help='Shows the composition of open, closed, and invalid tickets for each feature. X-axis: feature names, Y-axis: ticket count.')
 
         if not df_filtered.empty:
-            df_plot2 = df_filtered.copy()
-            
-            # Persiapan Data (Sama seperti sebelumnya)
-            solved_states = ['Done', 'RESOLVE', 'Resolve', 'Done.', 'DONE']
-            invalid_states = ['Invalid']
-
-            def categorize_ticket_state(status):
-                if status in solved_states: return 'Closed'
-                elif status in invalid_states: return 'Invalid'
-                else: return 'Open'
-            
-            df_plot2['Ticket_State'] = df_plot2['Status'].apply(categorize_ticket_state)
-            
-            feature_order = df_plot2['Feature'].value_counts().index
+            # Ticket_State sudah dihitung saat data dimuat (jiraProgress_proc)
+            df_plot2 = df_filtered
+
+            feature_counts = df_plot2['Feature'].value_counts()
+            feature_order = feature_counts[feature_counts > 0].index
             
-            chart_data2 = df_plot2.groupby(['Feature', 'Ticket_State']).size().reset_index(name='Jumlah Tiket')
+            chart_data2 = df_plot2.groupby(['Feature', 'Ticket_State'], observed=True).size().reset_index(name='Jumlah Tiket')
             pivot_df = chart_data2.pivot(index='Feature', columns='Ticket_State', values='Jumlah Tiket').fillna(0)
             pivot_df = pivot_df.reindex(feature_order)
             
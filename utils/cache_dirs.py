@@ -0,0 +1,7 @@
+import os
+
+# Folder cache lokal, bisa dipindah lewat environment variable (misal ke volume persisten).
+CACHE_DIR = os.environ.get('JIRA_CACHE_DIR', os.path.join('.cache', 'jira'))
+
+# File download Google Drive yang belum selesai disimpan di sini agar bisa dilanjutkan.
+DOWNLOAD_DIR = os.path.join(CACHE_DIR, 'downloads')
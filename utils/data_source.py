@@ -0,0 +1,138 @@
+import mmap
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Iterator
+
+import streamlit as st
+
+from utils.gdrive_conn import DOWNLOAD_CHUNK_SIZE, get_files_metadata, iter_file_chunks
+
+
+def get_config_value(section: str, key: str, default=None):
+    """
+    Membaca nilai konfigurasi dari st.secrets tanpa gagal ketika secrets.toml tidak ada
+    (misalnya saat menjalankan aplikasi atau benchmark secara offline).
+    """
+    try:
+        return st.secrets.get(section, {}).get(key, default)
+    except FileNotFoundError:
+        return default
+
+
+class DataSource(ABC):
+    """
+    Interface sumber file export JIRA.
+
+    Metadata file selalu berbentuk dict {'id', 'name', 'modifiedTime', 'size'},
+    sama seperti hasil get_files_metadata() di utils/gdrive_conn.py.
+    """
+
+    @abstractmethod
+    def list_files(self) -> dict:
+        """
+        Mengembalikan {nama_file: metadata} untuk seluruh file yang tersedia.
+        """
+
+    @abstractmethod
+    def open_stream(self, file_meta: dict, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Membaca isi file sebagai potongan bytes (atau memoryview) berurutan.
+        """
+
+    def read_bytes(self, file_meta: dict) -> bytes:
+        """
+        Membaca seluruh isi file sekaligus. Hanya untuk file kecil seperti manifest.
+        """
+        return b''.join(bytes(chunk) for chunk in self.open_stream(file_meta))
+
+    def read_buffer(self, file_meta: dict):
+        """
+        Membaca seluruh isi file sebagai objek buffer (bytes, memoryview, atau mmap).
+        Dipakai format kolumnar yang harus dibaca utuh, misalnya Parquet.
+        """
+        return self.read_bytes(file_meta)
+
+
+class DriveDataSource(DataSource):
+    """
+    Sumber file dari parent folder Google Drive di st.secrets.
+    """
+
+    def list_files(self) -> dict:
+        return get_files_metadata()
+
+    def open_stream(self, file_meta: dict, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        return iter_file_chunks(
+            file_meta['id'],
+            chunk_size=chunk_size,
+            size=file_meta.get('size'),
+            modified_time=file_meta.get('modifiedTime'),
+        )
+
+
+class LocalDataSource(DataSource):
+    """
+    Sumber file dari direktori lokal (misalnya export di NFS mount atau data benchmark).
+
+    File dibaca lewat memory map, sehingga potongan yang dikirim ke parser adalah
+    memoryview langsung ke page cache tanpa salinan tambahan di memori Python.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _file_meta(self, name: str, st_result: os.stat_result) -> dict:
+        modified = datetime.fromtimestamp(st_result.st_mtime_ns / 1e9, tz=timezone.utc)
+        return {
+            'id': os.path.join(self.root, name),
+            'name': name,
+            'modifiedTime': modified.isoformat(timespec='microseconds').replace('+00:00', 'Z'),
+            'size': st_result.st_size,
+        }
+
+    def list_files(self) -> dict:
+        with os.scandir(self.root) as entries:
+            return {
+                entry.name: self._file_meta(entry.name, entry.stat())
+                for entry in entries
+                if entry.is_file()
+            }
+
+    def read_buffer(self, file_meta: dict):
+        with open(file_meta['id'], 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def open_stream(self, file_meta: dict, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[memoryview]:
+        with open(file_meta['id'], 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(mapped)
+        try:
+            for start in range(0, len(view), chunk_size):
+                yield view[start:start + chunk_size]
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # Masih ada potongan yang dipegang pembaca; mmap ditutup oleh GC nanti.
+                pass
+
+
+@st.cache_resource
+def get_data_source() -> DataSource:
+    """
+    Memilih backend sumber data untuk seluruh proses.
+
+    Direktori lokal dipakai jika env JIRA_DATA_DIR atau data_source.LOCAL_DIR
+    di st.secrets diisi; selain itu memakai Google Drive.
+    """
+    local_dir = os.environ.get('JIRA_DATA_DIR') or get_config_value('data_source', 'LOCAL_DIR')
+    if local_dir:
+        return LocalDataSource(local_dir)
+    return DriveDataSource()
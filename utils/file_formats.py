@@ -0,0 +1,173 @@
+import itertools
+import zlib
+from typing import Iterable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.jira_schema import apply_jira_schema, read_jira_csv
+from utils.streaming import chunk_stream
+
+FORMAT_CSV = 'csv'
+FORMAT_CSV_GZIP = 'csv.gz'
+FORMAT_CSV_ZSTD = 'csv.zst'
+FORMAT_PARQUET = 'parquet'
+FORMAT_ARROW = 'arrow'
+FORMAT_ARROW_STREAM = 'arrow-stream'
+
+COLUMNAR_FORMATS = (FORMAT_PARQUET, FORMAT_ARROW, FORMAT_ARROW_STREAM)
+
+# Urutan penting: sufiks yang lebih panjang dicek lebih dulu.
+_SUFFIX_FORMATS = (
+    ('.csv.gz', FORMAT_CSV_GZIP),
+    ('.csv.zst', FORMAT_CSV_ZSTD),
+    ('.gz', FORMAT_CSV_GZIP),
+    ('.zst', FORMAT_CSV_ZSTD),
+    ('.parquet', FORMAT_PARQUET),
+    ('.arrow', FORMAT_ARROW),
+    ('.feather', FORMAT_ARROW),
+    ('.arrows', FORMAT_ARROW_STREAM),
+    ('.csv', FORMAT_CSV),
+)
+
+_MAGIC_FORMATS = (
+    (b'\x1f\x8b', FORMAT_CSV_GZIP),
+    (b'\x28\xb5\x2f\xfd', FORMAT_CSV_ZSTD),
+    (b'PAR1', FORMAT_PARQUET),
+    (b'ARROW1', FORMAT_ARROW),
+    (b'\xff\xff\xff\xff', FORMAT_ARROW_STREAM),
+)
+
+# Jika yang diminta 'jira_tiket.csv', file-file ini juga diterima. Yang dipakai yang paling baru;
+# urutan ini (dari yang paling ringkas) hanya penentu jika modifiedTime-nya sama.
+_VARIANT_SUFFIXES = ('.parquet', '.arrow', '.feather', '.csv.zst', '.csv.gz', '.csv')
+
+
+def format_from_name(name: str) -> str | None:
+    """
+    Menebak format file dari ekstensinya. None jika ekstensi tidak dikenal.
+    """
+    lower = name.lower()
+    for suffix, fmt in _SUFFIX_FORMATS:
+        if lower.endswith(suffix):
+            return fmt
+    return None
+
+
+def format_from_magic(head: bytes) -> str | None:
+    """
+    Menebak format file dari beberapa byte pertamanya. None jika tidak dikenali (dianggap teks).
+    """
+    for magic, fmt in _MAGIC_FORMATS:
+        if head.startswith(magic):
+            return fmt
+    return None
+
+
+def source_name_variants(name: str) -> list[str]:
+    """
+    Daftar nama alternatif untuk satu file export, misal 'jira_tiket.csv' ->
+    ['jira_tiket.parquet', 'jira_tiket.arrow', ..., 'jira_tiket.csv.gz', 'jira_tiket.csv'].
+    """
+    lower = name.lower()
+    for suffix in sorted(_VARIANT_SUFFIXES, key=len, reverse=True):
+        if lower.endswith(suffix):
+            stem = name[:-len(suffix)]
+            return [stem + variant for variant in _VARIANT_SUFFIXES]
+    return [name]
+
+
+def _gunzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Dekompresi gzip secara streaming (termasuk file gzip multi-member).
+    """
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = bytes(chunk)
+        while data:
+            out = decompressor.decompress(data)
+            if out:
+                yield out
+            if not decompressor.eof:
+                break
+            data = decompressor.unused_data
+            decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def _unzstd_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Dekompresi zstd secara streaming. Membutuhkan paket 'zstandard'.
+    """
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Membaca file .zst membutuhkan paket 'zstandard' (pip install zstandard).") from e
+
+    dctx = zstandard.ZstdDecompressor()
+    decompressor = dctx.decompressobj()
+    for chunk in chunks:
+        data = bytes(chunk)
+        while data:
+            out = decompressor.decompress(data)
+            if out:
+                yield out
+            if not decompressor.eof:
+                break
+            data = decompressor.unused_data
+            decompressor = dctx.decompressobj()
+
+
+def read_columnar(buffer, fmt: str) -> pd.DataFrame:
+    """
+    Membaca Parquet / Arrow IPC dari buffer di memori (bytes, memoryview, atau mmap).
+    """
+    source = pa.py_buffer(buffer)
+    if fmt == FORMAT_PARQUET:
+        table = pq.read_table(pa.BufferReader(source))
+    elif fmt == FORMAT_ARROW:
+        table = pa.ipc.open_file(source).read_all()
+    elif fmt == FORMAT_ARROW_STREAM:
+        table = pa.ipc.open_stream(source).read_all()
+    else:
+        raise ValueError(f"Format kolumnar tidak dikenal: {fmt}")
+    return apply_jira_schema(table.to_pandas())
+
+
+def read_source_frame(backend, file_meta: dict) -> pd.DataFrame:
+    """
+    Membaca satu file export menjadi DataFrame dengan reader yang sesuai formatnya.
+
+    Format ditentukan dari nama file, lalu dipastikan lagi lewat magic bytes
+    pada chunk pertama (misal file .csv yang ternyata gzip). CSV biasa maupun
+    terkompresi diparse secara streaming; Parquet / Arrow dibaca utuh karena
+    metadata-nya ada di akhir file.
+
+    Args:
+        backend (DataSource): Backend sumber file.
+        file_meta (dict): Metadata file dari backend.
+
+    Returns:
+        pd.DataFrame: Data mentah (tipe kolom sesuai jira_schema) sebelum jiraProgress_proc.
+    """
+    fmt = format_from_name(file_meta['name'])
+    if fmt in COLUMNAR_FORMATS:
+        return read_columnar(backend.read_buffer(file_meta), fmt)
+
+    chunks = iter(backend.open_stream(file_meta))
+    first = next(chunks, b'')
+    fmt = format_from_magic(bytes(first[:8])) or fmt or FORMAT_CSV
+    chunks = itertools.chain([first], chunks)
+
+    if fmt in COLUMNAR_FORMATS:
+        return read_columnar(b''.join(bytes(chunk) for chunk in chunks), fmt)
+    if fmt == FORMAT_CSV_GZIP:
+        chunks = _gunzip_chunks(chunks)
+    elif fmt == FORMAT_CSV_ZSTD:
+        chunks = _unzstd_chunks(chunks)
+
+    with chunk_stream(chunks) as stream:
+        return read_jira_csv(stream)
@@ -1,15 +1,79 @@
 
 
+import glob
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, suppress
+from datetime import datetime, timezone
+
+import httplib2
+import google_auth_httplib2
 import streamlit as st
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 from io import BytesIO
 
-@st.cache_data
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses
+    fcntl = None
+
+from utils.cache_dirs import DOWNLOAD_DIR
+
+# Ukuran halaman maksimum yang diizinkan Drive API untuk files().list
+LIST_PAGE_SIZE = 1000
+LIST_FIELDS = 'nextPageToken, files(id, name, modifiedTime, size)'
+# Listing penuh berkala untuk menangkap file yang dihapus dari folder
+FULL_LISTING_INTERVAL_SECONDS = 30 * 60
+# Ukuran potongan (Range request) download untuk mode streaming
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get('GDRIVE_DOWNLOAD_CHUNK_SIZE', 4 * 1024 * 1024))
+# Jumlah percobaan ulang (dengan exponential backoff) untuk setiap potongan download
+DOWNLOAD_RETRIES = int(os.environ.get('GDRIVE_DOWNLOAD_RETRIES', 5))
+# Access token diperbarui selama ini sebelum kedaluwarsa. Harus lebih besar dari
+# ambang google-auth (sekitar 4 menit) agar request user tidak sempat me-refresh sendiri.
+TOKEN_REFRESH_MARGIN_SECONDS = 5 * 60
+# Jeda sebelum mencoba lagi jika refresh token di background gagal.
+TOKEN_RETRY_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+# httplib2.Http tidak thread-safe, jadi tiap thread memakai koneksinya sendiri.
+_thread_local = threading.local()
+
+def _refresh_token_forever(creds):
+    """
+    Loop background yang me-refresh access token sebelum kedaluwarsa,
+    sehingga request ke Drive tidak pernah menunggu round-trip OAuth.
+    """
+    request = google_auth_httplib2.Request(httplib2.Http())
+    while True:
+        try:
+            creds.refresh(request)
+            # expiry dari google-auth berupa datetime UTC tanpa timezone
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            expires_in = (creds.expiry - now).total_seconds() if creds.expiry else 0
+            delay = max(expires_in - TOKEN_REFRESH_MARGIN_SECONDS, TOKEN_RETRY_SECONDS)
+        except Exception:
+            # Token lama (jika masih berlaku) tetap dipakai; google-auth akan
+            # me-refresh sendiri di request berikutnya kalau sudah kedaluwarsa.
+            logger.exception("Gagal me-refresh token Google Drive, dicoba lagi dalam %ds", TOKEN_RETRY_SECONDS)
+            delay = TOKEN_RETRY_SECONDS
+        time.sleep(delay)
+
+@st.cache_resource
 def authenticate():
     """
     Autentikasi ke Google Drive menggunakan credentials dari st.secrets.
+
+    Satu objek Credentials dipakai bersama oleh seluruh session dan thread
+    (tidak di-pickle ulang seperti st.cache_data). Access token-nya diperbarui
+    oleh background thread sebelum kedaluwarsa.
     """
 
     creds_dict = st.secrets["gcp_service_account"]
@@ -17,43 +81,308 @@ def authenticate():
     scope = st.secrets["gdrive_config"]["SCOPE_ID"]
 
     creds = service_account.Credentials.from_service_account_info(creds_dict, scopes=scope)
+
+    threading.Thread(
+        target=_refresh_token_forever,
+        args=(creds,),
+        name="gdrive-token-refresh",
+        daemon=True,
+    ).start()
     return creds
 
-@st.cache_data
+def _thread_http():
+    """
+    Mengembalikan AuthorizedHttp milik thread yang sedang berjalan.
+    Koneksi tetap dipakai ulang di dalam satu thread, tapi tidak dibagi antar thread.
+    """
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(authenticate(), http=httplib2.Http())
+        _thread_local.http = http
+    return http
+
+def _build_request(http, *args, **kwargs):
+    """
+    requestBuilder untuk service Drive: setiap request memakai http milik thread pemanggil.
+    """
+    return HttpRequest(_thread_http(), *args, **kwargs)
+
+def _api_endpoint():
+    """
+    Endpoint API opsional (misal server tiruan lokal untuk testing).
+    Bisa diatur lewat env GDRIVE_API_ENDPOINT atau gdrive_config.API_ENDPOINT di st.secrets.
+    """
+    endpoint = os.environ.get('GDRIVE_API_ENDPOINT')
+    if endpoint:
+        return endpoint
+    return st.secrets["gdrive_config"].get("API_ENDPOINT")
+
+@st.cache_resource
+def get_drive_service():
+    """
+    Membuat client Google Drive v3 sekali untuk seluruh proses.
+
+    Client dibangun dari discovery document statis yang sudah dibundel di
+    google-api-python-client, jadi tidak ada request discovery ke jaringan.
+    Disimpan sebagai resource (bukan di-pickle lewat st.cache_data) dan
+    aman dipakai dari banyak thread karena http-nya per thread.
+    """
+    endpoint = _api_endpoint()
+    return build_from_document(
+        get_static_doc('drive', 'v3'),
+        credentials=authenticate(),
+        requestBuilder=_build_request,
+        client_options={'api_endpoint': endpoint} if endpoint else None,
+    )
+
+def _list_folder(service, parent_folder, modified_after=None):
+    """
+    Mengambil seluruh file di parent folder, halaman demi halaman (mengikuti nextPageToken).
+
+    Args:
+        service: Client Google Drive dari get_drive_service().
+        parent_folder (str): ID folder induk.
+        modified_after (str | None): Jika diisi, hanya file dengan modifiedTime setelah nilai ini.
+
+    Returns:
+        list[dict]: Item file dengan field id, name, modifiedTime, dan size.
+    """
+    query = f"'{parent_folder}' in parents and trashed=false"
+    if modified_after:
+        query += f" and modifiedTime > '{modified_after}'"
+
+    items = []
+    page_token = None
+    while True:
+        results = service.files().list(
+            q=query,
+            spaces='drive',
+            fields=LIST_FIELDS,
+            pageSize=LIST_PAGE_SIZE,
+            orderBy='modifiedTime desc',
+            pageToken=page_token
+        ).execute()
+
+        items.extend(results.get('files', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return items
+
+class DriveFileIndex:
+    """
+    Index nama file -> metadata (id, modifiedTime, size) untuk satu parent folder.
+
+    Refresh berikutnya hanya meminta file dengan modifiedTime di atas nilai
+    terbesar yang sudah pernah dilihat. Listing penuh tetap dilakukan secara
+    berkala untuk menangkap file yang dihapus atau dipindah keluar folder.
+    """
+
+    def __init__(self, parent_folder):
+        self.parent_folder = parent_folder
+        self._files = {}
+        self._latest_modified = None
+        self._last_full_listing = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Memperbarui index dari Google Drive dan mengembalikan isinya.
+
+        Returns:
+            dict: {nama_file: {'id': ..., 'name': ..., 'modifiedTime': ..., 'size': ...}}
+        """
+        with self._lock:
+            full_listing = (
+                self._last_full_listing is None
+                or time.monotonic() - self._last_full_listing > FULL_LISTING_INTERVAL_SECONDS
+            )
+            items = _list_folder(
+                get_drive_service(),
+                self.parent_folder,
+                modified_after=None if full_listing else self._latest_modified
+            )
+
+            files = {} if full_listing else dict(self._files)
+            names_by_id = {entry['id']: name for name, entry in files.items()}
+            for item in items:
+                entry = {
+                    'id': item['id'],
+                    'name': item['name'],
+                    'modifiedTime': item.get('modifiedTime'),
+                    'size': int(item['size']) if item.get('size') else None,
+                }
+                # File yang di-rename muncul lagi dengan id yang sama, buang nama lamanya.
+                old_name = names_by_id.get(entry['id'])
+                if old_name is not None and old_name != entry['name'] and files.get(old_name, {}).get('id') == entry['id']:
+                    del files[old_name]
+
+                existing = files.get(entry['name'])
+                if existing is None or (entry['modifiedTime'] or '') >= (existing['modifiedTime'] or ''):
+                    files[entry['name']] = entry
+                    names_by_id[entry['id']] = entry['name']
+
+                if entry['modifiedTime'] and entry['modifiedTime'] > (self._latest_modified or ''):
+                    self._latest_modified = entry['modifiedTime']
+
+            if full_listing:
+                self._last_full_listing = time.monotonic()
+            self._files = files
+            return files
+
+    def get(self, name):
+        """
+        Mencari metadata file berdasarkan nama dari index terakhir (tanpa request ke Drive).
+        """
+        return self._files.get(name)
+
+@st.cache_resource
+def get_file_index():
+    """
+    Satu DriveFileIndex untuk PARENT_FOLDER di st.secrets, dibagi seluruh proses.
+    """
+    return DriveFileIndex(st.secrets["gdrive_config"]["PARENT_FOLDER"])
+
+def get_files_metadata():
+    """
+    Mengambil metadata file di parent folder yang ditentukan di st.secrets.
+    Index diperbarui secara inkremental setiap kali fungsi ini dipanggil,
+    supaya modifiedTime yang didapat selalu yang terbaru.
+
+    Returns:
+        dict: {nama_file: {'id': ..., 'name': ..., 'modifiedTime': ..., 'size': ...}}
+    """
+    return get_file_index().refresh()
+
 def get_list_files():
     """
     Mengambil daftar file dari parent folder yang ditentukan di st.secrets.
     """
-    creds = authenticate()
-    service = build('drive', 'v3', credentials=creds)
-
-    parent_folder = st.secrets["gdrive_config"]["PARENT_FOLDER"]
-    
-    results = service.files().list(
-        q=f"'{parent_folder}' in parents and trashed=false",
-        spaces='drive',
-        fields='files(id, name, modifiedTime)'
-    ).execute()
-    
-    items = results.get('files', [])
-    return {item['name']: item['id'] for item in items}
-
-@st.cache_data
+    return {name: meta['id'] for name, meta in get_files_metadata().items()}
+
+def _partial_download_path(file_id, modified_time):
+    """
+    Path file .part untuk satu versi file. Versi ditandai modifiedTime, sehingga
+    potongan dari versi lama tidak pernah disambung dengan versi yang baru.
+    """
+    version = re.sub(r'[^\w-]', '_', modified_time)
+    return os.path.join(DOWNLOAD_DIR, f"{file_id}.{version}.part")
+
+@contextmanager
+def _partial_download_lock(file_id):
+    """
+    Lock eksklusif antar thread dan proses (fcntl.flock pada file .lock) untuk
+    semua file .part satu file Drive. Pembaca lain untuk file yang sama menunggu
+    sampai download ini selesai atau gagal, lalu melanjutkan dari .part yang ada.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(os.path.join(DOWNLOAD_DIR, f"{file_id}.lock"), 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def _remove_stale_partials(file_id, keep_path):
+    """
+    Menghapus file .part milik versi lain dari file yang sama.
+    Hanya dipanggil selagi memegang _partial_download_lock untuk file_id ini.
+    """
+    for path in glob.glob(os.path.join(DOWNLOAD_DIR, f"{glob.escape(file_id)}.*.part")):
+        if path != keep_path:
+            with suppress(OSError):
+                os.remove(path)
+
+def _download_range(service, file_id, start, end):
+    """
+    Mengunduh byte start..end (inklusif) dengan header Range.
+    Error sementara (5xx, 429, koneksi putus) dicoba ulang dengan exponential backoff.
+    Mengembalikan b'' jika start sudah melewati akhir file.
+    """
+    request = service.files().get_media(fileId=file_id)
+    request.headers['range'] = f'bytes={start}-{end}'
+    try:
+        return request.execute(num_retries=DOWNLOAD_RETRIES)
+    except HttpError as e:
+        if e.resp.status == 416:
+            return b''
+        raise
+
+def _iter_ranges(service, file_id, offset, size, chunk_size):
+    """
+    Meng-yield potongan file mulai dari offset sampai habis (atau sampai size jika diketahui).
+    """
+    while size is None or offset < size:
+        chunk = _download_range(service, file_id, offset, offset + chunk_size - 1)
+        if not chunk:
+            break
+        offset += len(chunk)
+        yield chunk
+        if len(chunk) < chunk_size:
+            break
+
 def read_file_from_drive(file_id):
     """
     Membaca konten file dari Google Drive berdasarkan ID-nya.
-    Fungsi ini tidak perlu diubah karena sudah memanggil authenticate() yang baru.
+    Sengaja tidak di-cache: ID file tetap sama walaupun isinya diperbarui,
+    dan hasil akhirnya sudah di-cache oleh loader di utils/jira_data.py.
     """
-    creds = authenticate()
-    service = build('drive', 'v3', credentials=creds)
-    
-    request = service.files().get_media(fileId=file_id)
-    file_data = BytesIO()
-    downloader = MediaIoBaseDownload(file_data, request)
-    
-    done = False
-    while not done:
-        _, done = downloader.next_chunk()
-        
-    file_data.seek(0)
-    return file_data
\ No newline at end of file
+    return BytesIO(b''.join(iter_file_chunks(file_id)))
+
+def iter_file_chunks(file_id, chunk_size=DOWNLOAD_CHUNK_SIZE, size=None, modified_time=None):
+    """
+    Mengunduh file dari Google Drive per potongan (Range request) dan langsung meng-yield-nya.
+    Berbeda dengan read_file_from_drive, isi file tidak pernah ditampung utuh di memori.
+
+    Jika modified_time diketahui, setiap potongan juga ditulis ke file .part di
+    DOWNLOAD_DIR. Jika download gagal setelah semua percobaan ulang, file .part
+    tetap disimpan; percobaan berikutnya untuk versi file yang sama memutar ulang
+    isi .part lalu melanjutkan dari byte terakhir, bukan mengunduh dari awal.
+    Akses ke .part dijaga _partial_download_lock, jadi thread atau worker lain
+    yang membaca file yang sama tidak saling menimpa.
+
+    Tanpa modified_time versi file tidak bisa dipastikan, jadi file diunduh
+    langsung dari awal tanpa .part.
+
+    Args:
+        file_id (str): ID file di Google Drive.
+        chunk_size (int): Ukuran tiap potongan dalam byte.
+        size (int | None): Ukuran file dari metadata Drive, jika diketahui.
+        modified_time (str | None): modifiedTime file, penanda versi untuk file .part.
+
+    Yields:
+        bytes: Potongan isi file sesuai urutan.
+    """
+    service = get_drive_service()
+    size = int(size) if size is not None else None
+
+    if not modified_time:
+        yield from _iter_ranges(service, file_id, 0, size, chunk_size)
+        return
+
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    part_path = _partial_download_path(file_id, modified_time)
+
+    with _partial_download_lock(file_id):
+        _remove_stale_partials(file_id, part_path)
+
+        with open(part_path, 'a+b') as part:
+            # Putar ulang bagian yang sudah diunduh pada percobaan sebelumnya.
+            part.seek(0)
+            while True:
+                chunk = part.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+            offset = part.tell()
+
+            for chunk in _iter_ranges(service, file_id, offset, size, chunk_size):
+                part.write(chunk)
+                part.flush()
+                yield chunk
+
+        # File sudah lengkap, .part tidak dibutuhkan lagi.
+        with suppress(FileNotFoundError):
+            os.remove(part_path)
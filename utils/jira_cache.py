@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import re
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses
+    fcntl = None
+
+from utils.cache_dirs import CACHE_DIR
+
+# Naikkan angka ini setiap kali hasil jiraProgress_proc berubah bentuk,
+# supaya file cache lama otomatis dianggap tidak valid.
+CACHE_FORMAT_VERSION = 14
+
+# Key di metadata schema Arrow tempat identitas versi cache disimpan.
+_CACHE_META_KEY = b'jira_cache'
+
+# Jenis tabel yang disimpan per sumber data: data tiket, event riwayat status,
+# dan kolom teks panjang (detail tiket).
+KIND_FRAME = 'frame'
+KIND_EVENTS = 'events'
+KIND_DETAILS = 'details'
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_paths(source: str, kind: str = KIND_FRAME) -> tuple[str, str]:
+    """
+    Menentukan path file data (Arrow IPC) untuk satu jenis tabel dan lock file untuk satu sumber data.
+    """
+    safe_name = re.sub(r'[^\w.-]', '_', source)
+    base = os.path.join(CACHE_DIR, safe_name)
+    data_path = f"{base}.arrow" if kind == KIND_FRAME else f"{base}.{kind}.arrow"
+    return data_path, f"{base}.lock"
+
+
+def _source_fingerprint(files: list[dict]) -> list[dict]:
+    """
+    Ringkasan id dan modifiedTime seluruh file sumber, dipakai sebagai kunci validasi cache.
+    """
+    return [{'id': f['id'], 'modifiedTime': f.get('modifiedTime')} for f in files]
+
+
+def _cache_meta(files: list[dict]) -> dict:
+    return {
+        'files': _source_fingerprint(files),
+        'format_version': CACHE_FORMAT_VERSION,
+    }
+
+
+def frame_from_table(table: pa.Table) -> pd.DataFrame:
+    """
+    Mengubah tabel Arrow menjadi DataFrame tanpa menyalin kolom teks.
+
+    Kolom string menjadi string[pyarrow] yang tetap menunjuk ke buffer Arrow
+    (untuk cache: halaman memory map yang dibagi antar proses), bukan jutaan
+    objek str Python di setiap proses.
+    """
+    return table.to_pandas(
+        types_mapper={
+            pa.string(): pd.StringDtype('pyarrow'),
+            pa.large_string(): pd.StringDtype('pyarrow'),
+        }.get,
+        split_blocks=True,
+    )
+
+
+@contextmanager
+def cache_build_lock(source: str):
+    """
+    Lock eksklusif antar proses (fcntl.flock pada file .lock) untuk membangun cache satu sumber.
+    Worker lain yang butuh cache yang sama menunggu, lalu membaca hasilnya.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    _, lock_path = _cache_paths(source)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_cached_frame(source: str, files: list[dict], kind: str = KIND_FRAME) -> pd.DataFrame | None:
+    """
+    Membaca DataFrame hasil jiraProgress_proc dari cache lokal.
+
+    File Arrow IPC di-memory-map read-only, jadi semua worker di mesin yang
+    sama berbagi halaman page cache yang sama. Cache hanya dipakai kalau id
+    dan modifiedTime seluruh file sumber masih sama dengan yang tercatat di
+    metadata file cache.
+
+    Args:
+        source (str): Nama file, pola, atau manifest yang diminta loader.
+        files (list[dict]): Metadata file sumber (id, modifiedTime) sesuai urutan gabungan.
+        kind (str): KIND_FRAME untuk data tiket, KIND_EVENTS untuk event riwayat status,
+            KIND_DETAILS untuk kolom teks panjang.
+
+    Returns:
+        pd.DataFrame | None: DataFrame dari cache, atau None jika cache tidak ada / sudah basi.
+    """
+    if not files or any(not f.get('modifiedTime') for f in files):
+        return None
+
+    data_path, _ = _cache_paths(source, kind)
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(data_path, 'r'))
+    except FileNotFoundError:
+        return None
+    except (OSError, pa.ArrowInvalid) as e:
+        logger.warning("Cache '%s' tidak bisa dibaca, akan dibangun ulang: %s", data_path, e)
+        return None
+
+    try:
+        meta = json.loads((reader.schema.metadata or {}).get(_CACHE_META_KEY, b'{}'))
+    except json.JSONDecodeError:
+        return None
+    if meta != _cache_meta(files):
+        return None
+
+    try:
+        return frame_from_table(reader.read_all())
+    except Exception as e:
+        logger.warning("Cache '%s' tidak bisa dibaca, akan dibangun ulang: %s", data_path, e)
+        return None
+
+
+def write_cached_frame(df: pd.DataFrame, source: str, files: list[dict], kind: str = KIND_FRAME) -> pd.DataFrame:
+    """
+    Menyimpan DataFrame hasil jiraProgress_proc ke cache lokal dalam format Arrow IPC.
+
+    Identitas versi (id & modifiedTime file sumber) disimpan di metadata schema
+    file yang sama, sehingga data dan versinya selalu berganti bersamaan.
+    File ditulis ke file sementara lalu di-rename; proses lain yang masih
+    memory-map versi lama tetap aman karena file lama tidak ditimpa di tempat.
+    Kegagalan menulis cache tidak dianggap fatal.
+
+    Args:
+        df (pd.DataFrame): DataFrame yang sudah diproses.
+        source (str): Nama file, pola, atau manifest yang diminta loader.
+        files (list[dict]): Metadata file sumber (id, modifiedTime) sesuai urutan gabungan.
+        kind (str): KIND_FRAME untuk data tiket, KIND_EVENTS untuk event riwayat status,
+            KIND_DETAILS untuk kolom teks panjang.
+
+    Returns:
+        pd.DataFrame: DataFrame dari file cache yang di-memory-map, atau versi
+        di memori dengan tipe kolom yang sama jika cache gagal ditulis.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if not files or any(not f.get('modifiedTime') for f in files):
+        return frame_from_table(table)
+
+    data_path, _ = _cache_paths(source, kind)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _CACHE_META_KEY: json.dumps(_cache_meta(files)).encode('utf-8'),
+    })
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        with pa.OSFile(f"{data_path}.tmp", 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(f"{data_path}.tmp", data_path)
+    except Exception as e:
+        logger.warning("Gagal menulis cache '%s': %s", data_path, e)
+        return frame_from_table(table)
+
+    cached = read_cached_frame(source, files, kind)
+    return cached if cached is not None else frame_from_table(table)
@@ -0,0 +1,465 @@
+import fnmatch
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.data_source import DataSource, get_config_value, get_data_source
+from utils.file_formats import read_source_frame, source_name_variants
+from utils.jira_cache import KIND_DETAILS, KIND_EVENTS, KIND_FRAME, cache_build_lock, read_cached_frame, write_cached_frame
+from utils.jira_index import FacetIndex, LabelIndex
+from utils.jira_processed import (
+    build_quick_filters, build_status_events, compact_frame, jiraProgress_proc, platform_options,
+)
+from utils.jira_schema import HEAVY_COLUMNS, TIMEZONE
+from utils.single_flight import SingleFlight
+
+# Interval (detik) pengecekan modifiedTime file di sumber data oleh background poller.
+REFRESH_INTERVAL_SECONDS = int(os.environ.get('JIRA_REFRESH_INTERVAL', 300))
+# Batas jumlah file yang diunduh dan diparse bersamaan untuk export yang dipecah.
+MAX_PARALLEL_DOWNLOADS = int(os.environ.get('JIRA_MAX_PARALLEL_DOWNLOADS', 4))
+# Sumber yang berakhiran ini dibaca sebagai manifest (JSON berisi daftar nama file / pola).
+MANIFEST_SUFFIX = '.manifest.json'
+# Sumber data bawaan jika JIRA_SOURCE tidak diatur.
+DEFAULT_JIRA_SOURCE = 'jira_tiket.csv'
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class JiraDataset:
+    """
+    Satu versi data JIRA yang sudah diproses, beserta identitas file-file sumbernya.
+
+    events adalah tabel riwayat status seluruh tiket (lihat build_status_events),
+    urut per ticket_pos sehingga riwayat satu tiket selalu satu potongan berurutan.
+
+    Satu objek dipakai bersama oleh semua session dan halaman di proses ini
+    (lihat JiraDatasetStore). Tabel aslinya disimpan privat; properti frame,
+    events, dan details mengembalikan salinan dangkal (tanpa menyalin data).
+    Dengan copy-on-write (diaktifkan di Homepage.py), penulisan apa pun ke salinan itu (df.loc[...] = ...,
+    df['kolom'] = ..., untuk tipe kolom apa pun) hanya mengubah salinan tersebut,
+    bukan data milik session lain.
+
+    frame hanya berisi kolom ringan untuk filter, metrik, dan chart. Kolom teks
+    panjang (HEAVY_COLUMNS) ada di details, sebaris dengan frame, dan biasanya
+    masih di file cache yang di-memory-map; isinya baru dibaca dari disk saat
+    satu tiket dibuka (lihat ticket_details).
+    """
+    _frame: pd.DataFrame
+    _events: pd.DataFrame
+    _details: pd.DataFrame
+    files: tuple[tuple[str, str | None], ...]
+    loaded_at: datetime
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        Data tiket (kolom ringan), salinan dangkal milik pemanggil.
+        """
+        return self._frame.copy(deep=False)
+
+    @property
+    def events(self) -> pd.DataFrame:
+        """
+        Tabel event riwayat status, salinan dangkal milik pemanggil.
+        """
+        return self._events.copy(deep=False)
+
+    @property
+    def details(self) -> pd.DataFrame:
+        """
+        Kolom teks panjang sebaris dengan frame, salinan dangkal milik pemanggil.
+        """
+        return self._details.copy(deep=False)
+
+    @cached_property
+    def event_offsets(self) -> np.ndarray:
+        """
+        Riwayat tiket di posisi i adalah events.iloc[event_offsets[i]:event_offsets[i + 1]].
+        """
+        return np.searchsorted(self._events['ticket_pos'].to_numpy(), np.arange(len(self._frame) + 1))
+
+    @cached_property
+    def _ticket_positions(self) -> dict:
+        tickets = self._frame['Tickets'].tolist()
+        # Jika ada ID ganda (export yang tumpang tindih), posisi pertama yang dipakai.
+        return {ticket: pos for pos, ticket in reversed(list(enumerate(tickets)))}
+
+    @cached_property
+    def label_index(self) -> LabelIndex:
+        """
+        Keanggotaan tiket per label, dipecah sekali per versi data (lihat LabelIndex).
+        """
+        if 'Labels' not in self._frame.columns:
+            return LabelIndex.from_series(pd.Series([None] * len(self._frame), dtype='string'))
+        return LabelIndex.from_series(self._frame['Labels'])
+
+    @cached_property
+    def facet_index(self) -> FacetIndex:
+        """
+        Bitmap baris per nilai Status, Feature, Stage, dan Severity, dibangun sekali per versi data.
+        """
+        return FacetIndex.from_frame(self._frame)
+
+    @cached_property
+    def platform_options(self) -> list[str]:
+        """
+        Pilihan filter platform yang benar-benar ada di data (lihat platform_options).
+        """
+        if 'Platform_Flags' not in self._frame.columns:
+            return []
+        return platform_options(self._frame['Platform_Flags'])
+
+    @cached_property
+    def title_tag_index(self) -> LabelIndex:
+        """
+        Keanggotaan tiket per tag rilis / proyek di Title (kolom Title_Tags, lihat extract_title_tags).
+        """
+        if 'Title_Tags' not in self._frame.columns:
+            return LabelIndex.from_series(pd.Series([None] * len(self._frame), dtype='string'))
+        return LabelIndex.from_series(self._frame['Title_Tags'])
+
+    @cached_property
+    def quick_filters(self) -> dict[str, tuple[str, str | None]]:
+        """
+        Pilihan quick filter (st.pills) dari tag rilis / proyek di Title (lihat build_quick_filters).
+        """
+        return build_quick_filters(self._frame, self.title_tag_index)
+
+    def events_for(self, positions) -> pd.DataFrame:
+        """
+        Event riwayat untuk sekumpulan posisi tiket, misalnya df_filtered.index.
+        """
+        mask = np.isin(self._events['ticket_pos'].to_numpy(), np.asarray(positions))
+        return self._events[mask]
+
+    def ticket_details(self, ticket_id) -> dict:
+        """
+        Kolom teks panjang (Description, Comments_HTML, ...) untuk satu tiket.
+
+        Returns:
+            dict: {nama_kolom: nilai}; nilai kosong menjadi None.
+            Kosong jika tiket tidak ditemukan.
+        """
+        pos = self._ticket_positions.get(ticket_id)
+        # details kosong (0 baris) jika data sumber tidak punya satu pun kolom teks panjang.
+        if pos is None or pos >= len(self._details):
+            return {}
+        row = self._details.iloc[pos]
+        return {name: (value if pd.notna(value) else None) for name, value in row.items()}
+
+    def ticket_history(self, ticket_id) -> pd.DataFrame:
+        """
+        Riwayat status satu tiket, urut waktu.
+
+        Returns:
+            pd.DataFrame: Kolom timestamp (datetime WIB), status_from, status_to, author.
+            Kosong jika tiket tidak ditemukan atau tidak punya riwayat.
+        """
+        pos = self._ticket_positions.get(ticket_id)
+        if pos is None:
+            events = self._events.iloc[0:0]
+        else:
+            events = self._events.iloc[self.event_offsets[pos]:self.event_offsets[pos + 1]]
+
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(events['timestamp'].to_numpy(), utc=True).tz_convert(TIMEZONE),
+            # Nilai kosong menjadi None, sama seperti hasil json.loads sebelumnya.
+            **{
+                name: events[name].astype(object).where(events[name].notna(), None).to_numpy()
+                for name in ('status_from', 'status_to', 'author')
+            },
+        })
+
+
+def _files_version(files: list[dict]) -> tuple[tuple[str, str | None], ...]:
+    """
+    Identitas versi data: pasangan (id, modifiedTime) seluruh file sumber.
+    """
+    return tuple((f['id'], f.get('modifiedTime')) for f in files)
+
+
+def get_jira_source() -> str:
+    """
+    Nama file, pola glob, atau manifest yang dibaca halaman JIRA.
+    Diambil dari env JIRA_SOURCE atau gdrive_config.JIRA_SOURCE di st.secrets.
+    """
+    return (os.environ.get('JIRA_SOURCE')
+            or get_config_value('gdrive_config', 'JIRA_SOURCE', DEFAULT_JIRA_SOURCE))
+
+
+def _newest_variant(name: str, all_files: dict) -> str | None:
+    """
+    Memilih satu file untuk nama export biasa di antara varian formatnya
+    (lihat source_name_variants): yang modifiedTime-nya paling baru, supaya
+    Parquet lama yang tertinggal di folder tidak menutupi CSV yang terus diperbarui.
+    Jika modifiedTime sama (atau tidak ada), varian yang paling ringkas diutamakan.
+    """
+    candidates = [variant for variant in source_name_variants(name) if variant in all_files]
+    if not candidates:
+        return None
+    # Urutan candidates sudah dari yang paling ringkas; max() mengambil yang pertama jika seri.
+    newest = max(candidates, key=lambda variant: all_files[variant].get('modifiedTime') or '')
+    others = [variant for variant in candidates if variant != newest]
+    if others:
+        logger.info("Sumber '%s': memakai '%s' (paling baru), mengabaikan %s.", name, newest, ', '.join(others))
+    return newest
+
+
+def resolve_source_files(source: str, backend: DataSource) -> list[dict]:
+    """
+    Menerjemahkan sumber data menjadi daftar file di backend (Google Drive / direktori lokal).
+
+    Sumber bisa berupa:
+    - nama file biasa, misal 'jira_tiket.csv'. Versi ringkasnya juga diterima
+      (jira_tiket.parquet, .arrow, .csv.zst, .csv.gz); yang dipakai adalah
+      yang modifiedTime-nya paling baru (lihat _newest_variant);
+    - pola glob, misal 'jira_tiket_*.csv' (semua file yang cocok, urut nama);
+    - manifest 'xxx.manifest.json' berisi list nama file / pola,
+      atau objek {"files": [...]}.
+
+    Args:
+        source (str): Nama file, pola glob, atau nama manifest.
+        backend (DataSource): Backend sumber file.
+
+    Returns:
+        list[dict]: Metadata file yang cocok, urutan inilah yang dipakai saat digabung.
+    """
+    all_files = backend.list_files()
+
+    if source.endswith(MANIFEST_SUFFIX):
+        manifest_meta = all_files.get(source)
+        if not manifest_meta:
+            return []
+        manifest = json.loads(backend.read_bytes(manifest_meta))
+        patterns = manifest.get('files', []) if isinstance(manifest, dict) else manifest
+    else:
+        patterns = [source]
+
+    matched = []
+    seen = set()
+    for pattern in patterns:
+        if any(ch in pattern for ch in '*?['):
+            names = sorted(fnmatch.filter(all_files, pattern))
+        else:
+            newest = _newest_variant(pattern, all_files)
+            names = [newest] if newest else []
+        for name in names:
+            if name not in seen:
+                seen.add(name)
+                matched.append(all_files[name])
+    return matched
+
+
+def _download_and_process(files: list[dict], backend: DataSource) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Mengunduh, mem-parse, dan menggabungkan seluruh file sumber, lalu menjalankan
+    jiraProgress_proc, memadatkan tipe kolom (compact_frame), dan memecah riwayat
+    status menjadi tabel event.
+
+    Returns:
+        tuple: (data tiket tanpa kolom teks panjang, tabel event, kolom teks panjang).
+    """
+    def download_and_parse(file_meta):
+        # Format (CSV, CSV terkompresi, Parquet, Arrow) dideteksi otomatis
+        return read_source_frame(backend, file_meta)
+
+    if len(files) == 1:
+        df_raw = download_and_parse(files[0])
+    else:
+        # Export yang dipecah diunduh dan diparse paralel, lalu digabung sesuai urutan.
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_DOWNLOADS, len(files))) as executor:
+            parts = list(executor.map(download_and_parse, files))
+        df_raw = pd.concat(parts, ignore_index=True)
+    df_processed = compact_frame(jiraProgress_proc(df_raw))
+    events = build_status_events(df_processed)
+
+    heavy_columns = [name for name in HEAVY_COLUMNS if name in df_processed.columns]
+    return df_processed.drop(columns=heavy_columns), events, df_processed[heavy_columns]
+
+
+def _read_cached_dataset(source: str, files: list[dict]) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame] | None:
+    """
+    Membaca data tiket, tabel event, dan kolom teks panjang dari cache;
+    None jika salah satunya tidak ada / basi.
+    """
+    tables = []
+    for kind in (KIND_FRAME, KIND_EVENTS, KIND_DETAILS):
+        table = read_cached_frame(source, files, kind)
+        if table is None:
+            return None
+        tables.append(table)
+    return tuple(tables)
+
+
+def _build_dataset(source: str, files: list[dict], backend: DataSource) -> JiraDataset:
+    """
+    Membangun JiraDataset dari cache lokal atau, jika cache basi, dari backend sumber data.
+    Tidak memanggil elemen UI Streamlit (peringatan data hanya dicatat di log)
+    sehingga aman dijalankan di background thread.
+
+    Pembangunan ulang dijaga lock file antar proses: jika beberapa worker
+    Streamlit berjalan di mesin yang sama, hanya satu yang mengunduh dan
+    memproses; worker lain menunggu lalu memory-map file cache yang sama.
+    """
+    cached = _read_cached_dataset(source, files)
+    if cached is None:
+        with cache_build_lock(source):
+            # Bisa jadi worker lain baru saja selesai membangun cache ini.
+            cached = _read_cached_dataset(source, files)
+            if cached is None:
+                df_processed, events, details = _download_and_process(files, backend)
+                cached = (
+                    write_cached_frame(df_processed, source, files),
+                    write_cached_frame(events, source, files, KIND_EVENTS),
+                    write_cached_frame(details, source, files, KIND_DETAILS),
+                )
+    df_processed, events, details = cached
+
+    return JiraDataset(
+        _frame=df_processed,
+        _events=events,
+        _details=details,
+        files=_files_version(files),
+        loaded_at=datetime.now(),
+    )
+
+
+class JiraDatasetStore:
+    """
+    Menyimpan versi data terbaru untuk satu sumber data dan memperbaruinya di background.
+
+    Pembaca selalu mendapatkan versi yang sedang aktif (stale-while-revalidate).
+    Versi baru dibangun sepenuhnya di poller thread, lalu ditukar dengan satu
+    assignment sehingga rerun user tidak pernah menunggu proses reload.
+
+    Load pertama dan refresh lewat SingleFlight: jika banyak session masuk
+    bersamaan saat cache masih kosong, hanya satu yang mengunduh dan memproses
+    data, sisanya menunggu hasil yang sama.
+    """
+
+    def __init__(self, source: str, backend: DataSource, refresh_interval: int = REFRESH_INTERVAL_SECONDS):
+        self.source = source
+        self.backend = backend
+        self.refresh_interval = refresh_interval
+        self._dataset: JiraDataset | None = None
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+
+        self._poller = threading.Thread(
+            target=self._poll_forever,
+            name=f"jira-refresh-{source}",
+            daemon=True,
+        )
+        self._poller.start()
+
+    def get(self) -> JiraDataset:
+        """
+        Mengembalikan dataset aktif. Hanya load pertama kali yang memblokir pemanggil.
+        """
+        dataset = self._dataset
+        if dataset is not None:
+            return dataset
+        return self._loads.do('initial', self._load_initial)
+
+    def _load_initial(self) -> JiraDataset:
+        if self._dataset is not None:
+            return self._dataset
+
+        files = resolve_source_files(self.source, self.backend)
+        if not files:
+            raise FileNotFoundError(f"File '{self.source}' tidak ditemukan di sumber data.")
+        dataset = self._loads.do(
+            _files_version(files), _build_dataset, self.source, files, self.backend
+        )
+        with self._lock:
+            if self._dataset is None:
+                self._dataset = dataset
+            return self._dataset
+
+    def refresh(self) -> bool:
+        """
+        Mengecek modifiedTime file di sumber data dan menukar dataset jika ada file yang berubah.
+
+        Returns:
+            bool: True jika dataset baru berhasil dipasang.
+        """
+        files = resolve_source_files(self.source, self.backend)
+        current = self._dataset
+        if not files or current is None:
+            return False
+        version = _files_version(files)
+        if current.files == version:
+            return False
+
+        new_dataset = self._loads.do(version, _build_dataset, self.source, files, self.backend)
+        with self._lock:
+            if self._dataset is new_dataset:
+                return False
+            self._dataset = new_dataset
+        logger.info("Dataset '%s' diperbarui (%d file)", self.source, len(files))
+        return True
+
+    def _poll_forever(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception:
+                # Biarkan versi lama tetap dipakai, coba lagi di interval berikutnya.
+                logger.exception("Gagal memperbarui dataset '%s'", self.source)
+
+
+@st.cache_resource
+def get_dataset_store(source: str) -> JiraDatasetStore:
+    """
+    Satu JiraDatasetStore per sumber data untuk seluruh proses (dibagi antar session).
+    """
+    return JiraDatasetStore(source, get_data_source())
+
+
+def load_jira_dataset(source: str) -> JiraDataset | None:
+    """
+    Fungsi ini melakukan seluruh proses:
+    1. Mencari file yang cocok dengan sumber (nama file, pola glob, atau manifest)
+       beserta id & modifiedTime-nya di sumber data (Google Drive atau direktori lokal).
+    2. Jika cache lokal masih cocok dengan modifiedTime, langsung memory-map cache (Arrow IPC)
+       yang dibagi oleh semua worker di mesin yang sama.
+    3. Jika tidak, unduh semua file secara paralel dan streaming sambil diparse
+       (CSV, CSV.gz/.zst, Parquet, atau Arrow IPC terdeteksi otomatis),
+       gabungkan menjadi satu DataFrame, lalu proses.
+    4. Simpan hasil proses ke cache lokal untuk worker lain dan start berikutnya.
+    5. Mengembalikan JiraDataset: DataFrame yang sudah bersih (frame), tabel event
+       riwayat status (events), dan kolom teks panjang (details).
+       None jika gagal (error sudah ditampilkan).
+
+    Data disimpan di JiraDatasetStore yang dibagi antar session dan diperbarui
+    oleh background poller, sehingga hanya load pertama yang harus menunggu.
+    Setiap rerun menerima objek JiraDataset yang sama (tanpa deserialisasi);
+    frame / events / details yang dibaca darinya adalah salinan dangkal, jadi
+    perubahan di satu halaman tidak terlihat di session lain.
+    Session yang datang bersamaan saat load pertama ikut menunggu load yang sama,
+    bukan mengunduh sendiri. Error tidak di-cache, jadi rerun berikutnya akan mencoba lagi.
+    """
+    try:
+        return get_dataset_store(source).get()
+
+    except FileNotFoundError as fe:
+        st.error(str(fe))
+        return None
+    except ValueError as ve:
+        st.error(f"Error saat memproses data: {ve}")
+        return None
+    except Exception as e:
+        st.error(f"Terjadi kesalahan yang tidak terduga: {e}")
+        return None
@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Pemisah antar label di kolom Labels export JIRA.
+LABEL_SEPARATOR = ','
+
+
+@dataclass(frozen=True)
+class LabelIndex:
+    """
+    Indeks keanggotaan tiket x label dalam bentuk CSR.
+
+    Posisi tiket yang punya label labels[i] adalah
+    positions[indptr[i]:indptr[i + 1]] (urut naik, tanpa duplikat).
+    Posisi mengacu ke urutan baris DataFrame sumber, sama seperti ticket_pos
+    di tabel event riwayat status.
+    """
+    labels: np.ndarray
+    indptr: np.ndarray
+    positions: np.ndarray
+    size: int
+
+    @classmethod
+    def from_series(cls, values: pd.Series) -> 'LabelIndex':
+        """
+        Memecah kolom Labels ("a, b, c") sekali menjadi indeks keanggotaan per label.
+
+        Args:
+            values (pd.Series): Kolom Labels, satu baris per tiket.
+
+        Returns:
+            LabelIndex: Indeks dengan label unik urut abjad.
+        """
+        exploded = (
+            pd.Series(values.to_numpy(), dtype='string')
+            .str.split(LABEL_SEPARATOR)
+            .explode()
+            .str.strip()
+        )
+        exploded = exploded[exploded.notna() & (exploded != '')]
+
+        codes, labels = pd.factorize(exploded, sort=True)
+        positions = exploded.index.to_numpy(dtype=np.int64)
+        # Urutkan per label lalu per posisi; label yang sama dua kali di satu tiket cukup dicatat sekali.
+        order = np.lexsort((positions, codes))
+        codes, positions = codes[order], positions[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (positions[1:] != positions[:-1])
+        codes, positions = codes[keep], positions[keep]
+
+        indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(labels)), out=indptr[1:])
+        return cls(
+            labels=np.asarray(labels, dtype=object),
+            indptr=indptr,
+            positions=positions.astype(np.int32),
+            size=len(values),
+        )
+
+    @property
+    def options(self) -> list[str]:
+        """
+        Daftar label unik (urut abjad) untuk pilihan filter.
+        """
+        return self.labels.tolist()
+
+    def mask(self, selected) -> np.ndarray:
+        """
+        Mask boolean sepanjang data sumber: True untuk tiket yang punya salah satu label terpilih.
+
+        Label dicocokkan persis (bukan substring); label yang tidak dikenal diabaikan.
+        """
+        result = np.zeros(self.size, dtype=bool)
+        codes = np.searchsorted(self.labels, list(selected)) if len(self.labels) else []
+        for code, label in zip(codes, selected):
+            if code < len(self.labels) and self.labels[code] == label:
+                result[self.positions[self.indptr[code]:self.indptr[code + 1]]] = True
+        return result
+
+
+# Kolom kategori yang diindeks per nilai untuk filter multiselect.
+FACET_COLUMNS = ('Status', 'Feature', 'Stage', 'Severity')
+
+
+@dataclass(frozen=True)
+class FacetIndex:
+    """
+    Bitmap per nilai untuk kolom kategori (facet) seperti Status atau Feature.
+
+    bitmaps[kolom][i] adalah bitmap ter-pack (np.packbits, bitorder little)
+    baris yang nilainya values[kolom][i]. Filter dalam satu facet adalah OR
+    bitmap nilai terpilih, antar facet AND, lalu di-unpack sekali di akhir.
+    """
+    values: dict[str, pd.Index]
+    bitmaps: dict[str, np.ndarray]
+    size: int
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns=FACET_COLUMNS) -> 'FacetIndex':
+        """
+        Membangun bitmap untuk setiap nilai unik kolom-kolom facet (yang ada di df).
+
+        Args:
+            df (pd.DataFrame): Data tiket, posisi baris = posisi di bitmap.
+            columns (tuple): Nama kolom facet.
+
+        Returns:
+            FacetIndex: Indeks bitmap per kolom.
+        """
+        values, bitmaps = {}, {}
+        for name in columns:
+            if name not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[name], sort=True)
+            # Baris kosong (kode -1) tidak masuk bitmap mana pun, sama seperti isin.
+            bitmaps[name] = np.stack([
+                np.packbits(codes == code, bitorder='little') for code in range(len(uniques))
+            ]) if len(uniques) else np.zeros((0, (len(df) + 7) // 8), dtype=np.uint8)
+            values[name] = pd.Index(uniques)
+        return cls(values=values, bitmaps=bitmaps, size=len(df))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.bitmaps
+
+    def mask(self, selections: dict) -> np.ndarray:
+        """
+        Mask boolean untuk kombinasi filter {kolom: [nilai terpilih]}.
+
+        Kolom dengan pilihan kosong tidak membatasi; nilai yang tidak dikenal diabaikan.
+
+        Returns:
+            np.ndarray: Mask boolean sepanjang data sumber.
+        """
+        packed = None
+        for name, selected in selections.items():
+            if not selected:
+                continue
+            codes = self.values[name].get_indexer(list(selected))
+            codes = codes[codes >= 0]
+            facet = np.bitwise_or.reduce(self.bitmaps[name][codes], axis=0) if len(codes) \
+                else np.zeros(self.bitmaps[name].shape[1], dtype=np.uint8)
+            packed = facet if packed is None else packed & facet
+
+        if packed is None:
+            return np.ones(self.size, dtype=bool)
+        return np.unpackbits(packed, count=self.size, bitorder='little').astype(bool)
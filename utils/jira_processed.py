@@ -1,5 +1,261 @@
+import json
+import logging
+import re
+
+import numpy as np
 import pandas as pd
-import streamlit as st
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.jira_index import LABEL_SEPARATOR, LabelIndex
+from utils.jira_schema import STRING_COLUMNS, TIMEZONE, apply_jira_schema, parse_iso_timestamps
+
+logger = logging.getLogger(__name__)
+
+# Satuan durasi di export JIRA ("2 hari 3 jam 15 menit") dan nilainya dalam jam.
+DURATION_UNIT_HOURS = {'hari': 24.0, 'jam': 1.0, 'menit': 1 / 60}
+
+# Kolom durasi teks dan kolom numerik (jam) hasil parsing-nya.
+DURATION_COLUMNS = {
+    'Duration_toResolve': 'Duration_toResolve_Hours',
+    'Time_Since_Last_Status_Update': 'Time_Since_Last_Status_Update_Hours',
+}
+
+
+def durations_to_hours(values: pd.Series) -> pd.Series:
+    """
+    Mengubah kolom durasi seperti "2 hari 3 jam 15 menit" menjadi jumlah jam (float).
+
+    Setiap satuan diambil dengan satu regex untuk seluruh kolom sekaligus
+    (pyarrow compute), bukan per baris. Untuk setiap satuan hanya angka pertama
+    yang dipakai; nilai kosong, tidak dikenali, atau berdurasi 0 menjadi NaN.
+
+    Args:
+        values (pd.Series): Kolom teks durasi.
+
+    Returns:
+        pd.Series: Durasi dalam jam dengan index yang sama.
+    """
+    texts = pa.array(values.astype('string'), type=pa.string(), from_pandas=True)
+    total = np.zeros(len(values))
+    for unit, unit_hours in DURATION_UNIT_HOURS.items():
+        matches = pc.extract_regex(texts, rf'(?P<amount>\d+)\s*{unit}')
+        amounts = pc.fill_null(pc.cast(pc.struct_field(matches, 'amount'), pa.float64()), 0.0)
+        total += amounts.to_numpy() * unit_hours
+    hours = pd.Series(total, index=values.index)
+    return hours.where(hours > 0)
+
+
+def format_hours_to_days_hours(total_hours):
+    """
+    Memformat jumlah jam menjadi teks seperti "2 hari 3 jam" atau "45 menit".
+    """
+    if pd.isna(total_hours) or total_hours < 0:
+        return "N/A"
+    if total_hours < 1:
+        minutes = round(total_hours * 60)
+        if minutes == 0 and total_hours > 0:
+            return "Kurang dari 1 menit"
+        return f"{minutes} menit"
+    days = int(total_hours // 24)
+    remaining_hours = int(total_hours % 24)
+    parts = []
+    if days > 0:
+        parts.append(f"{days} hari")
+    if remaining_hours > 0:
+        parts.append(f"{remaining_hours} jam")
+    return " ".join(parts) if parts else f"{days} hari"
+
+# Tabel normalisasi status JIRA. Key adalah status yang sudah di-strip, tanpa titik
+# di akhir, dan huruf besar ("Done." -> "DONE"); status lain dianggap masih Open.
+STATUS_STATE_TABLE = {
+    'DONE': 'Closed',
+    'RESOLVE': 'Closed',
+    'CLOSED': 'Closed',
+    'INVALID': 'Invalid',
+    'REOPENED': 'Reopened',
+    'REOPEN': 'Reopened',
+}
+
+# Kategori hasil normalisasi status (per event) dan state akhir tiket.
+STATUS_STATES = pd.CategoricalDtype(['Open', 'Reopened', 'Closed', 'Invalid'])
+TICKET_STATES = pd.CategoricalDtype(['Open', 'Closed', 'Invalid'])
+
+
+def _status_key(status) -> str:
+    return str(status).strip().rstrip('.').upper()
+
+
+def classify_statuses(values: pd.Series) -> pd.Series:
+    """
+    Menormalisasi kolom status JIRA menjadi kategori STATUS_STATES lewat STATUS_STATE_TABLE.
+
+    Tabel hanya dicocokkan sekali per kategori unik, lalu diterapkan ke
+    seluruh baris lewat kode category, jadi tidak ada .apply per baris.
+
+    Args:
+        values (pd.Series): Kolom status (category atau teks).
+
+    Returns:
+        pd.Series: Category STATUS_STATES dengan index yang sama; status kosong menjadi NaN.
+    """
+    values = values.astype('category')
+    category_states = pd.Categorical(
+        [STATUS_STATE_TABLE.get(_status_key(c), 'Open') for c in values.cat.categories],
+        dtype=STATUS_STATES,
+    )
+    # Kode -1 (status kosong) mengambil elemen terakhir, yaitu -1 lagi.
+    lookup = np.append(category_states.codes, -1).astype(np.int8)
+    codes = lookup[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=STATUS_STATES), index=values.index, name=values.name)
+
+
+def ticket_states(values: pd.Series) -> pd.Series:
+    """
+    Menentukan state akhir tiket (Open / Closed / Invalid) dari kolom status.
+    Tiket Reopened dan tiket tanpa status dihitung Open.
+    """
+    states = classify_statuses(values)
+    # Kode STATUS_STATES (Open, Reopened, Closed, Invalid, lalu -1 untuk kosong) -> kode TICKET_STATES.
+    lookup = np.array([
+        TICKET_STATES.categories.get_loc(state)
+        for state in ('Open', 'Open', 'Closed', 'Invalid', 'Open')
+    ], dtype=np.int8)
+    codes = lookup[states.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=TICKET_STATES), index=values.index, name='Ticket_State')
+
+
+# Pilihan filter untuk platform di luar katalog (misalnya "Web"), supaya tiketnya tetap bisa difilter.
+PLATFORM_OTHER = 'Other'
+# Katalog platform tetap; posisi di tuple ini adalah nomor bit di kolom Platform_Flags.
+PLATFORM_CATALOG = ('Android', 'iOS', PLATFORM_OTHER)
+# Pemisah platform gabungan, misalnya "Android, iOS" atau "android & ios".
+_PLATFORM_SEPARATOR = re.compile(r'\s*(?:[,&/+]|\band\b)\s*', re.IGNORECASE)
+
+
+def platform_bits(names) -> int:
+    """
+    Bitmask Platform_Flags untuk sekumpulan nama platform dari PLATFORM_CATALOG.
+    """
+    bits = 0
+    for name in names:
+        if name in PLATFORM_CATALOG:
+            bits |= 1 << PLATFORM_CATALOG.index(name)
+    return bits
+
+
+def platform_options(flags: pd.Series) -> list[str]:
+    """
+    Pilihan filter platform: nama di PLATFORM_CATALOG yang bitnya muncul di Platform_Flags.
+    """
+    present = int(np.bitwise_or.reduce(flags.to_numpy(), initial=0))
+    return [name for bit, name in enumerate(PLATFORM_CATALOG) if present & (1 << bit)]
+
+
+def platform_flags(values: pd.Series) -> pd.Series:
+    """
+    Mengubah kolom Platform menjadi bitmask (uint8) sesuai PLATFORM_CATALOG.
+
+    Tiket gabungan seperti "Android & iOS" menyalakan kedua bit. Platform yang
+    tidak ada di katalog menyalakan bit PLATFORM_OTHER. Seperti status, teks hanya
+    dipecah sekali per kategori unik lalu diterapkan lewat kode category.
+
+    Args:
+        values (pd.Series): Kolom Platform (category atau teks).
+
+    Returns:
+        pd.Series: Bitmask uint8 dengan index yang sama; 0 jika platform kosong.
+    """
+    values = values.astype('category')
+    catalog = {name.lower(): name for name in PLATFORM_CATALOG}
+    category_bits, unknown = [], set()
+    for category in values.cat.categories:
+        tokens = [token for token in _PLATFORM_SEPARATOR.split(str(category).strip()) if token]
+        names = [catalog.get(token.lower(), PLATFORM_OTHER) for token in tokens]
+        unknown.update(token for token in tokens if token.lower() not in catalog)
+        category_bits.append(platform_bits(names))
+    if unknown:
+        logger.warning("Platform di luar katalog digolongkan sebagai '%s': %s", PLATFORM_OTHER, ', '.join(sorted(unknown)))
+
+    # Kode -1 (platform kosong) mengambil elemen terakhir, yaitu 0.
+    lookup = np.append(np.asarray(category_bits, dtype=np.uint8), np.uint8(0))
+    return pd.Series(lookup[values.cat.codes.to_numpy()], index=values.index, name='Platform_Flags')
+
+
+# Tag rilis / proyek yang diambil dari Title: (regex satu tag, Stage yang dibuatkan quick filter).
+# Stage None berarti satu quick filter untuk semua Stage; tuple berarti satu quick filter per
+# Stage yang ada di data, misalnya "SITBAU GS 9.10.1". Tambahkan baris di sini untuk jenis tag
+# baru; nilai tag baru (misal "GS 9.11.0") otomatis muncul sebagai quick filter tanpa perubahan kode.
+TITLE_TAG_PATTERNS = (
+    (r'\bPTR \d+(?:\.\d+)+\b', None),
+    (r'\bRelease \d+(?:\.\d+)+\b', ('Regression',)),
+    (r'\bGS \d+(?:\.\d+)+\b', ('Regression', 'PTR')),
+    (r'\bAlways On\b', ('Regression', 'PTR')),
+)
+
+# Nama Stage di label quick filter (tag yang dipisah per Stage), misalnya "SITBAU GS 9.10.1".
+QUICK_FILTER_STAGE_LABELS = {'Regression': 'SITBAU', 'PTR': 'PTR'}
+
+
+def extract_title_tags(titles: pd.Series) -> pd.Series:
+    """
+    Mengambil semua tag rilis / proyek dari Title sesuai TITLE_TAG_PATTERNS.
+
+    Satu Title bisa memuat beberapa tag (misal "GS 9.10.1 Always On ..."), jadi
+    semua tag yang ditemukan disimpan, dipisah LABEL_SEPARATOR seperti kolom Labels,
+    dan dipecah menjadi indeks keanggotaan dengan LabelIndex.
+
+    Args:
+        titles (pd.Series): Kolom Title.
+
+    Returns:
+        pd.Series: Kolom Title_Tags (kosong jika Title tidak memuat tag).
+    """
+    titles = titles.astype('string')
+    found = pd.concat([
+        titles.str.extractall(f'({pattern})')[0]
+        for pattern, _ in TITLE_TAG_PATTERNS
+    ])
+    tags = found.groupby(level=0).agg(lambda values: LABEL_SEPARATOR.join(dict.fromkeys(values)))
+    return tags.reindex(titles.index).astype('string').rename('Title_Tags')
+
+
+def build_quick_filters(df: pd.DataFrame, tag_index: LabelIndex | None = None) -> dict[str, tuple[str, str | None]]:
+    """
+    Menyusun pilihan quick filter (st.pills) dari tag Title hasil extract_title_tags.
+
+    Args:
+        df (pd.DataFrame): DataFrame hasil jiraProgress_proc.
+        tag_index (LabelIndex | None): Indeks kolom Title_Tags milik df. Jika None, dibangun dari df.
+
+    Returns:
+        dict: {label_pill: (tag, stage atau None)}, misalnya
+        {'SITBAU GS 9.10.1': ('GS 9.10.1', 'Regression')}.
+    """
+    if 'Title_Tags' not in df.columns:
+        return {}
+    if tag_index is None:
+        tag_index = LabelIndex.from_series(df['Title_Tags'])
+    stages = df['Stage'].to_numpy() if 'Stage' in df.columns else None
+
+    quick_filters = {}
+    for pattern, pattern_stages in TITLE_TAG_PATTERNS:
+        regex = re.compile(pattern)
+        for code, tag in enumerate(tag_index.labels):
+            if not regex.fullmatch(tag):
+                continue
+            if pattern_stages is None:
+                quick_filters[tag] = (tag, None)
+                continue
+            if stages is None:
+                continue
+            positions = tag_index.positions[tag_index.indptr[code]:tag_index.indptr[code + 1]]
+            present = set(pd.unique(stages[positions]))
+            for stage in pattern_stages:
+                if stage in present:
+                    quick_filters[f"{QUICK_FILTER_STAGE_LABELS.get(stage, stage)} {tag}"] = (tag, stage)
+    return quick_filters
+
 
 def jiraProgress_proc(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -11,11 +267,166 @@ def jiraProgress_proc(df: pd.DataFrame) -> pd.DataFrame:
         # Daripada st.error, lebih baik raise Exception agar bisa ditangani di pemanggil
         raise ValueError("Kolom 'Tickets' atau 'Title' tidak ditemukan dalam data.")
 
-    if 'Created' in df.columns:
-        df['Created'] = pd.to_datetime(df['Created'], errors='coerce')
+    # Menyamakan tipe kolom (category, datetime, Int64); juga menyatukan
+    # category dari beberapa file export yang digabung.
+    df = apply_jira_schema(df)
+
+    if 'Created' not in df.columns:
+        # Dicatat di log, bukan st.warning: fungsi ini juga berjalan di thread refresh background.
+        logger.warning('Kolom "Created" tidak ditemukan, akan diisi dengan nilai kosong.')
+        df['Created'] = pd.Series(pd.NaT, index=df.index, dtype=f'datetime64[ns, {TIMEZONE}]')
+
+    # Tanggal (WIB, tanpa jam) untuk filter rentang tanggal tanpa normalize per rerun.
+    df['Created_Date'] = df['Created'].dt.tz_localize(None).dt.normalize()
+
+    # State tiket dari satu tabel normalisasi; dipakai semua metrik, chart, dan filter.
+    if 'Status' in df.columns:
+        df['Ticket_State'] = ticket_states(df['Status'])
+    else:
+        df['Ticket_State'] = pd.Series('Open', index=df.index, dtype=TICKET_STATES)
+    df['Is_Open'] = (df['Ticket_State'] == 'Open').to_numpy()
+    df['Is_Closed'] = (df['Ticket_State'] == 'Closed').to_numpy()
+    df['Is_Invalid'] = (df['Ticket_State'] == 'Invalid').to_numpy()
+
+    # Platform dinormalisasi menjadi bitmask supaya filter cukup satu operasi bitwise.
+    if 'Platform' in df.columns:
+        df['Platform_Flags'] = platform_flags(df['Platform'])
     else:
-        st.warning('Kolom "Created" tidak ditemukan, akan diisi dengan nilai kosong.')
-        df['Created'] = pd.NaT
+        df['Platform_Flags'] = np.zeros(len(df), dtype=np.uint8)
+
+    # Tag rilis / proyek dari Title untuk quick filter (lihat TITLE_TAG_PATTERNS).
+    df['Title_Tags'] = extract_title_tags(df['Title'])
+
+    # Durasi teks diparse sekali di sini supaya halaman cukup memakai kolom numeriknya.
+    for text_column, hours_column in DURATION_COLUMNS.items():
+        if text_column in df.columns:
+            df[hours_column] = durations_to_hours(df[text_column])
+        else:
+            df[hours_column] = np.nan
+
+    return df
+
+# Kolom teks di luar skema dijadikan category jika rasio nilai uniknya paling banyak segini.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def memory_report(before: pd.Series, after: pd.Series) -> pd.DataFrame:
+    """
+    Membandingkan pemakaian memori per kolom (hasil DataFrame.memory_usage(deep=True)).
+
+    Returns:
+        pd.DataFrame: Kolom before_bytes, after_bytes, dan saved_bytes per kolom,
+        urut dari penghematan terbesar, dengan baris 'TOTAL' di akhir.
+    """
+    report = pd.DataFrame({'before_bytes': before, 'after_bytes': after}).fillna(0).astype('int64')
+    report['saved_bytes'] = report['before_bytes'] - report['after_bytes']
+    report = report.sort_values('saved_bytes', ascending=False)
+    report.loc['TOTAL'] = report.sum()
+    return report
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Memadatkan DataFrame hasil jiraProgress_proc sebelum disimpan / dibagi antar session.
+
+    - kolom teks dengan sedikit nilai unik (di luar kolom teks bebas skema) menjadi category;
+    - teks lain menjadi string[pyarrow] (satu buffer Arrow, bukan objek str per sel);
+    - bilangan bulat dan float diturunkan ke tipe terkecil yang cukup (misalnya Int16, float32).
+
+    Pemakaian memori per kolom sebelum dan sesudah dicatat di log (lihat memory_report).
+
+    Args:
+        df (pd.DataFrame): DataFrame hasil jiraProgress_proc.
+
+    Returns:
+        pd.DataFrame: DataFrame yang sama dengan tipe kolom yang lebih ringkas.
+    """
+    before = df.memory_usage(deep=True, index=False)
+
+    for name in df.columns:
+        values = df[name]
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype) \
+                or pd.api.types.is_datetime64_any_dtype(dtype):
+            continue
+
+        if dtype == object or pd.api.types.is_string_dtype(dtype):
+            # Teks bebas (termasuk HTML / JSON panjang) tidak pernah jadi category, jadi tidak perlu di-hash.
+            if name not in STRING_COLUMNS \
+                    and values.nunique() / max(len(values), 1) <= CATEGORY_MAX_UNIQUE_RATIO:
+                df[name] = values.astype('category')
+            elif dtype != pd.StringDtype('pyarrow'):
+                df[name] = values.astype(pd.StringDtype('pyarrow'))
+        elif pd.api.types.is_integer_dtype(dtype):
+            # Bitmask (uint) tetap unsigned supaya bit teratas tidak berubah tanda.
+            downcast = 'unsigned' if pd.api.types.is_unsigned_integer_dtype(dtype) else 'integer'
+            df[name] = pd.to_numeric(values, downcast=downcast)
+        elif pd.api.types.is_float_dtype(dtype):
+            df[name] = pd.to_numeric(values, downcast='float')
+
+    report = memory_report(before, df.memory_usage(deep=True, index=False))
+    logger.info("Memori data JIRA per kolom (byte):\n%s", report.to_string())
+    return df
+
+
+# Kolom tabel event riwayat status hasil build_status_events.
+EVENT_COLUMNS = ('ticket_pos', 'timestamp', 'status_from', 'status_to', 'state_to', 'author')
+
+
+def build_status_events(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Memecah kolom Status_History_JSON seluruh tiket menjadi satu tabel event kolumnar.
+
+    JSON cukup diparse sekali saat data dimuat; halaman hanya memotong tabel ini
+    (lihat JiraDataset.ticket_history / events_for) tanpa json.loads per baris.
+
+    Args:
+        df (pd.DataFrame): DataFrame hasil jiraProgress_proc.
+
+    Returns:
+        pd.DataFrame: Kolom ticket_pos (posisi baris tiket di df, int32),
+        timestamp (nanodetik UTC, int64), status_from & status_to (category),
+        state_to (status_to yang dinormalisasi, category STATUS_STATES),
+        dan author (category). Diurutkan per tiket lalu per waktu, dan event
+        dengan timestamp tidak valid dibuang.
+    """
+    ticket_pos, timestamps, status_from, status_to, authors = [], [], [], [], []
+
+    if 'Status_History_JSON' in df.columns:
+        for pos, raw in enumerate(df['Status_History_JSON']):
+            if not isinstance(raw, str) or not raw:
+                continue
+            try:
+                history = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(history, list):
+                continue
+
+            for event in history:
+                if not isinstance(event, dict):
+                    continue
+                ticket_pos.append(pos)
+                timestamps.append(event.get('timestamp'))
+                status_from.append(event.get('status_from'))
+                status_to.append(event.get('status_to'))
+                authors.append(event.get('author'))
+
+    parsed = parse_iso_timestamps(pd.Series(timestamps, dtype=object))
+    events = pd.DataFrame({
+        'ticket_pos': np.asarray(ticket_pos, dtype=np.int32),
+        'timestamp': parsed,
+        'status_from': pd.Categorical(status_from),
+        'status_to': pd.Categorical(status_to),
+        'author': pd.Categorical(authors),
+    })
 
+    invalid = events['timestamp'].isna()
+    if invalid.any():
+        logger.warning("%d event riwayat status dibuang karena timestamp tidak valid.", int(invalid.sum()))
+        events = events[~invalid]
 
-    return df
\ No newline at end of file
+    events = events.sort_values(['ticket_pos', 'timestamp'], kind='stable', ignore_index=True)
+    events.insert(events.columns.get_loc('status_to') + 1, 'state_to', classify_statuses(events['status_to']))
+    events['timestamp'] = events['timestamp'].astype('int64')
+    return events
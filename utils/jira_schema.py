@@ -0,0 +1,173 @@
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+# Kolom wajib; tanpa kolom ini halaman JIRA tidak bisa ditampilkan.
+REQUIRED_COLUMNS = ('Tickets', 'Title')
+
+# Kolom dengan nilai berulang sedikit dibaca sebagai category.
+CATEGORY_COLUMNS = ('Status', 'Feature', 'Platform', 'Stage', 'Severity', 'Squad')
+
+# Kolom waktu. Diparse dengan format eksplisit di bawah, bukan ditebak per baris,
+# dan disimpan sebagai datetime tz-aware WIB.
+DATETIME_COLUMNS = ('Created', 'Resolved_Time', 'Testing_Time')
+
+# Format waktu yang dipakai export JIRA, dicoba berurutan untuk setiap kolom.
+DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+)
+
+# Zona waktu data JIRA (WIB). Waktu tanpa offset dianggap berada di zona ini.
+TIMEZONE = 'Asia/Jakarta'
+
+# Kolom bilangan bulat yang boleh kosong (dibaca sebagai Int64).
+INTEGER_COLUMNS = ('Count_Comments',)
+
+# Kolom teks lain yang dikenal di export JIRA.
+STRING_COLUMNS = (
+    'Tickets', 'Title', 'Labels', 'Bug Type', 'Fix_Versions', 'Device',
+    'Reporter', 'Assignee', 'Duration_toResolve', 'Time_Since_Last_Status_Update',
+    'Description', 'Comments_HTML', 'Status_History_JSON',
+)
+
+# Kolom teks panjang yang hanya dibutuhkan panel detail satu tiket. Disimpan terpisah
+# dari data tiket yang difilter (lihat JiraDataset.details / ticket_details).
+HEAVY_COLUMNS = ('Description', 'Comments_HTML', 'Status_History_JSON')
+
+KNOWN_COLUMNS = frozenset(CATEGORY_COLUMNS + DATETIME_COLUMNS + INTEGER_COLUMNS + STRING_COLUMNS)
+
+logger = logging.getLogger(__name__)
+
+
+def _arrow_column_types() -> dict:
+    """
+    Tipe kolom untuk pyarrow CSV reader sesuai skema di atas.
+    """
+    types = {name: pa.string() for name in STRING_COLUMNS + DATETIME_COLUMNS}
+    types.update({name: pa.dictionary(pa.int32(), pa.string()) for name in CATEGORY_COLUMNS})
+    # Dibaca float dulu supaya '3.0' (hasil export pandas) tetap diterima, lalu dijadikan Int64.
+    types.update({name: pa.float64() for name in INTEGER_COLUMNS})
+    return types
+
+
+def to_local_time(values: pd.Series) -> pd.Series:
+    """
+    Menyamakan kolom datetime ke zona waktu TIMEZONE.
+
+    Nilai tanpa zona waktu dianggap sudah dalam WIB, sedangkan nilai dengan
+    zona waktu lain dikonversi ke WIB.
+    """
+    if values.dt.tz is None:
+        return values.dt.tz_localize(TIMEZONE, ambiguous='NaT', nonexistent='NaT')
+    return values.dt.tz_convert(TIMEZONE)
+
+
+def parse_datetime_column(values: pd.Series) -> pd.Series:
+    """
+    Mengubah kolom teks waktu menjadi datetime WIB (tz-aware) dengan format eksplisit.
+
+    Setiap format di DATETIME_FORMATS dicoba untuk seluruh kolom sekaligus.
+    Jika tidak ada yang cocok untuk semua baris, kolom diparse dengan
+    inferensi pandas (nilai yang gagal menjadi NaT) dan dicatat di log.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return to_local_time(values)
+
+    for fmt in DATETIME_FORMATS:
+        try:
+            # Format dengan offset dibaca sebagai UTC supaya offset campuran tetap jadi satu kolom.
+            return to_local_time(pd.to_datetime(values, format=fmt, utc='%z' in fmt))
+        except (ValueError, TypeError):
+            continue
+
+    logger.warning("Kolom '%s' tidak cocok dengan format waktu yang dikenal, memakai inferensi.", values.name)
+    return parse_iso_timestamps(values, format='mixed')
+
+
+def parse_iso_timestamps(values: pd.Series, format: str = 'ISO8601') -> pd.Series:
+    """
+    Mengubah teks waktu yang sebagian punya offset dan sebagian tidak menjadi datetime WIB.
+
+    Nilai dengan offset (misalnya "+07:00" atau "Z") dikonversi dari offset-nya,
+    nilai tanpa offset dianggap sudah WIB. Nilai yang gagal diparse menjadi NaT.
+    """
+    values = values.astype('string')
+    has_offset = values.str.contains(r'(?:Z|[+-]\d{2}:?\d{2})$', na=False)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype=f'datetime64[ns, {TIMEZONE}]', name=values.name)
+    if has_offset.any():
+        parsed[has_offset] = pd.to_datetime(values[has_offset], format=format, utc=True, errors='coerce').dt.tz_convert(TIMEZONE)
+    if (~has_offset).any():
+        parsed[~has_offset] = to_local_time(pd.to_datetime(values[~has_offset], format=format, errors='coerce'))
+    return parsed
+
+
+def apply_jira_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Menyamakan tipe kolom DataFrame export JIRA dengan skema.
+
+    Dipakai untuk hasil parse CSV, file Parquet / Arrow dari luar, maupun
+    gabungan beberapa file (category yang berbeda antar file disatukan lagi).
+
+    Args:
+        df (pd.DataFrame): Data mentah export JIRA.
+
+    Returns:
+        pd.DataFrame: DataFrame yang sama dengan tipe kolom sesuai skema.
+
+    Raises:
+        ValueError: Jika kolom wajib tidak ada.
+    """
+    missing = [name for name in REQUIRED_COLUMNS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ditemukan dalam data: {', '.join(missing)}")
+
+    unknown = [name for name in df.columns if name not in KNOWN_COLUMNS]
+    if unknown:
+        logger.warning("Kolom di luar skema JIRA: %s", ', '.join(map(str, unknown)))
+
+    for name in CATEGORY_COLUMNS:
+        if name in df.columns and not isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].astype('category')
+
+    for name in DATETIME_COLUMNS:
+        if name in df.columns:
+            df[name] = parse_datetime_column(df[name])
+
+    for name in INTEGER_COLUMNS:
+        if name in df.columns and df[name].dtype != 'Int64':
+            df[name] = pd.to_numeric(df[name], errors='coerce').round().astype('Int64')
+
+    return df
+
+
+def read_jira_csv(stream) -> pd.DataFrame:
+    """
+    Mem-parse CSV export JIRA dengan pyarrow CSV reader sesuai skema kolom.
+
+    Parsing berjalan multithread per blok, dan blok pertama sudah diproses
+    selagi sisa stream masih diunduh. Nilai kosong dibaca sebagai null,
+    sama seperti pd.read_csv.
+
+    Args:
+        stream: File-like biner, misalnya hasil streaming.chunk_stream.
+
+    Returns:
+        pd.DataFrame: Data mentah dengan tipe kolom sesuai skema.
+    """
+    table = pa_csv.read_csv(
+        stream,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=_arrow_column_types(),
+            strings_can_be_null=True,
+        ),
+    )
+    return apply_jira_schema(table.to_pandas())
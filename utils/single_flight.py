@@ -0,0 +1,64 @@
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    """
+    Satu pemanggilan yang sedang berjalan beserta hasil atau error-nya.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Menggabungkan pemanggilan bersamaan dengan key yang sama menjadi satu eksekusi.
+
+    Thread pertama untuk sebuah key menjalankan fungsinya; thread lain yang datang
+    sebelum selesai hanya menunggu dan menerima hasil (atau error) yang sama.
+    Hasil tidak disimpan: setelah selesai, pemanggilan berikutnya akan menjalankan
+    fungsinya lagi, sehingga kegagalan tidak ikut di-cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """
+        Menjalankan fn(*args, **kwargs) sekali untuk semua pemanggil dengan key yang sama.
+
+        Args:
+            key (Hashable): Identitas pekerjaan, misalnya nama sumber data dan versinya.
+            fn (Callable): Fungsi yang dijalankan oleh pemanggil pertama.
+
+        Returns:
+            Any: Hasil fn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
@@ -0,0 +1,109 @@
+import io
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+# Jumlah chunk yang boleh antre di antara downloader dan parser (membatasi memori).
+MAX_PENDING_CHUNKS = 4
+
+_END_OF_STREAM = object()
+
+
+class ChunkQueueReader(io.RawIOBase):
+    """
+    File-like read-only yang isinya diisi oleh thread lain, chunk demi chunk.
+
+    Dipakai untuk menyambungkan downloader (producer) dengan parser (consumer),
+    sehingga parsing bisa dimulai sebelum seluruh file selesai diunduh.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_CHUNKS):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._buffer = memoryview(b'')
+        self._finished = False
+        self._cancelled = threading.Event()
+
+    def readable(self):
+        return True
+
+    def put(self, chunk: bytes) -> bool:
+        """
+        Menambahkan chunk ke antrean. Mengembalikan False jika pembaca sudah berhenti.
+        """
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(chunk, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def finish(self, error: BaseException | None = None):
+        """
+        Menandai akhir stream. Jika error diisi, error tersebut akan di-raise di sisi pembaca.
+        """
+        self.put(error if error is not None else _END_OF_STREAM)
+
+    def cancel(self):
+        """
+        Menghentikan producer yang sedang menunggu antrean kosong.
+        """
+        self._cancelled.set()
+
+    def readinto(self, b):
+        while not self._buffer:
+            if self._finished:
+                return 0
+            item = self._queue.get()
+            if item is _END_OF_STREAM:
+                self._finished = True
+                return 0
+            if isinstance(item, BaseException):
+                self._finished = True
+                raise item
+            self._buffer = memoryview(item)
+
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+@contextmanager
+def chunk_stream(chunks: Iterable[bytes]) -> Iterator[io.BufferedReader]:
+    """
+    Membuka iterator chunk bytes sebagai file-like yang bisa dibaca parser
+    sambil chunk berikutnya masih diunduh.
+
+    Chunk diambil di background thread, sementara parser membaca di thread
+    pemanggil. Dengan begitu waktu jaringan dan waktu parsing saling tumpang
+    tindih, dan bytes mentah tidak pernah ditampung utuh.
+
+    Args:
+        chunks (Iterable[bytes]): Sumber bytes, misalnya gdrive_conn.iter_file_chunks.
+
+    Yields:
+        io.BufferedReader: Stream yang dibaca parser (misal jira_schema.read_jira_csv).
+    """
+    reader = ChunkQueueReader()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not reader.put(chunk):
+                    return
+        except BaseException as e:
+            reader.finish(e)
+        else:
+            reader.finish()
+
+    producer = threading.Thread(target=produce, name="csv-stream-download", daemon=True)
+    producer.start()
+
+    try:
+        with io.BufferedReader(reader) as stream:
+            yield stream
+    finally:
+        reader.cancel()
+        producer.join()